@@ -14,10 +14,13 @@ bl_info = {
 }
 
 from . import virtual_driver
+from . import bake
 
 def register():
     virtual_driver.preregister()
     virtual_driver.register()
+    bake.register()
 
 def unregister():
+    bake.unregister()
     virtual_driver.unregister()
@@ -0,0 +1,327 @@
+
+import argparse
+from dataclasses import dataclass
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Iterable, Union
+import bpy
+import numpy as np
+from . import utils
+from . import property_tracer
+from . import virtual_driver
+
+
+# region constants
+_BAKE_DTYPE: type = np.float32
+_BAKE_CHUNK_FILE: str = 'chunk_{:04d}.npz'
+# endregion
+
+# region channels
+@dataclass
+class BakeChannel:
+    id: bpy.types.ID
+    data_path: str
+    array_index: int
+    entry: int
+    component: int
+    type: str
+
+def channel_path(acc: utils.Accessor) -> str:
+    if isinstance(acc.owner, bpy.types.ID):
+        return acc.prop_path
+    return acc.owner.path_from_id(acc.prop_path)
+
+def bake_channels(ivd: list[virtual_driver.InternalVirtualDriver]) -> list[BakeChannel]:
+    res: dict[tuple[int, int, str, int], BakeChannel] = dict()
+    for i, b in enumerate(ivd):
+        if not b.is_valid or b.mute:
+            continue
+        for acc in property_tracer.bindings(b):
+            if acc.length != b.array_length:
+                continue
+            path = channel_path(acc)
+            items = [(k, k) for k in range(acc.length)] if acc.is_vector else [(acc.array_index or 0, -1)]
+            for array_index, component in items:
+                res[(*utils.id_key(acc.id), path, array_index)] = BakeChannel(acc.id, path, array_index, i, component, acc.prop.type)
+    return list(res.values())
+# endregion
+
+# region sampling
+def bake_sample(
+    scene: bpy.types.Scene,
+    base: bpy.types.bpy_struct,
+    ivd: list[virtual_driver.InternalVirtualDriver],
+    channels: list[BakeChannel],
+    frames: np.ndarray
+) -> np.ndarray:
+    samples = np.empty((len(frames), len(channels)), dtype=_BAKE_DTYPE)
+    if not channels or not len(frames):
+        return samples
+
+    entries = np.array([c.entry for c in channels], dtype=np.int32)
+    components = np.array([c.component for c in channels], dtype=np.int32)
+    vector = components >= 0
+    current = scene.frame_current, scene.frame_subframe
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    try:
+        for k, frame in enumerate(frames.tolist()):
+            scene.frame_set(int(frame), subframe=frame-int(frame))
+            snapshot = virtual_driver.evaluated_snapshot(base, ivd, depsgraph)
+            samples[k] = snapshot.values[entries]
+            if vector.any():
+                samples[k, vector] = snapshot.vectors[entries[vector], components[vector]]
+    finally:
+        scene.frame_set(*current)
+
+    for j, c in enumerate(channels):
+        if c.type == 'INT':
+            samples[:, j] = np.trunc(samples[:, j])
+        elif c.type == 'BOOLEAN':
+            samples[:, j] = samples[:, j] != 0
+    return samples
+# endregion
+
+# region keyframes
+def bake_fcurve(id: bpy.types.ID, data_path: str, array_index: int) -> bpy.types.FCurve:
+    anim_data: bpy.types.AnimData = id.animation_data or id.animation_data_create()
+    if anim_data.action is None:
+        anim_data.action = bpy.data.actions.new(id.name+'Action')
+    fcurves: bpy.types.ActionFCurves = anim_data.action.fcurves
+    return fcurves.find(data_path, index=array_index) or fcurves.new(data_path, index=array_index)
+
+def keyframes_replace(fcurve: bpy.types.FCurve, frames: np.ndarray, values: np.ndarray) -> None:
+    points: bpy.types.FCurveKeyframePoints = fcurve.keyframe_points
+    co = np.empty(len(points)*2, dtype=_BAKE_DTYPE)
+    points.foreach_get('co', co)
+    inside = (co[0::2] >= frames[0]) & (co[0::2] <= frames[-1])
+    for i in np.flatnonzero(inside)[::-1].tolist():
+        points.remove(points[i], fast=True)
+
+    offset = len(points)
+    points.add(len(frames))
+    co = np.empty(len(points)*2, dtype=_BAKE_DTYPE)
+    points.foreach_get('co', co)
+    co[offset*2::2] = frames
+    co[offset*2+1::2] = values
+    points.foreach_set('co', co)
+    fcurve.update()
+
+def bake_write(channels: list[BakeChannel], frames: np.ndarray, samples: np.ndarray) -> None:
+    if not len(frames):
+        return
+    for c, values in zip(channels, samples.T):
+        keyframes_replace(bake_fcurve(c.id, c.data_path, c.array_index), frames, values)
+# endregion
+
+# region api
+def bake_frames(frame_start: int, frame_end: int, step: int = 1) -> np.ndarray:
+    return np.arange(frame_start, frame_end+1, max(step, 1), dtype=_BAKE_DTYPE)
+
+def bake_entries(ivd: list[virtual_driver.InternalVirtualDriver], entries: Iterable[int]) -> None:
+    for i in sorted(set(entries)):
+        ivd[i].mute = True
+
+def bake(
+    scene: bpy.types.Scene,
+    base: bpy.types.bpy_struct,
+    frame_start: int,
+    frame_end: int,
+    step: int = 1,
+    mute: bool = False
+) -> list[BakeChannel]:
+    base, vd, ivd, index, block = virtual_driver.get_props_sub(base)
+    if not ivd:
+        return []
+    frames = bake_frames(frame_start, frame_end, step)
+    channels = bake_channels(ivd)
+    samples = bake_sample(scene, base, ivd, channels, frames)
+    bake_write(channels, frames, samples)
+    if mute:
+        bake_entries(ivd, (c.entry for c in channels))
+    return channels
+# endregion
+
+# region parallel
+def channel_key(c: BakeChannel) -> str:
+    return repr(c.id)+'|'+c.data_path+'|'+str(c.array_index)
+
+def bake_chunks(frames: np.ndarray, workers: int) -> list[np.ndarray]:
+    return [chunk for chunk in np.array_split(frames, max(min(workers, len(frames)), 1)) if len(chunk)]
+
+def bake_worker_command(filepath: str, scene: str, frames: np.ndarray, step: int, output: str) -> list[str]:
+    return [
+        bpy.app.binary_path,
+        '--background',
+        filepath,
+        '--addons', __package__,
+        '--python-expr', 'import '+__name__+' as bake; bake.main()',
+        '--',
+        '--worker',
+        '--scene', scene,
+        '--frame-start', str(int(frames[0])),
+        '--frame-end', str(int(frames[-1])),
+        '--step', str(step),
+        '--output', output
+    ]
+
+def bake_worker(scene: bpy.types.Scene, frame_start: int, frame_end: int, step: int, output: str) -> None:
+    props = virtual_driver.get_props_extern(scene)
+    base, ivd = (props[0], props[2]) if not props is None else (None, None)
+    frames = bake_frames(frame_start, frame_end, step)
+    channels = bake_channels(ivd) if ivd else []
+    samples = bake_sample(scene, base, ivd, channels, frames)
+    np.savez(output, frames=frames, samples=samples, keys=np.array([channel_key(c) for c in channels], dtype=str))
+
+def bake_parallel(
+    scene: bpy.types.Scene,
+    frame_start: int,
+    frame_end: int,
+    step: int = 1,
+    workers: Union[int, None] = None,
+    mute: bool = False,
+    filepath: Union[str, None] = None
+) -> list[BakeChannel]:
+    if bpy.data.is_dirty and (filepath is None or os.path.abspath(filepath) == os.path.abspath(bpy.data.filepath)):
+        raise Exception('blend file has unsaved changes, save it before a parallel bake')
+    filepath = filepath or bpy.data.filepath
+    if not filepath:
+        raise Exception('blend file must be saved before a parallel bake')
+    props = virtual_driver.get_props_extern(scene)
+    if props is None or not props[2]:
+        return []
+    base, vd, ivd, index, block = props
+    channels = bake_channels(ivd)
+    frames = bake_frames(frame_start, frame_end, step)
+    chunks = bake_chunks(frames, workers or os.cpu_count() or 1)
+    if not channels or not chunks:
+        return channels
+
+    with tempfile.TemporaryDirectory() as directory:
+        outputs = [os.path.join(directory, _BAKE_CHUNK_FILE.format(i)) for i in range(len(chunks))]
+        processes = [
+            subprocess.Popen(bake_worker_command(filepath, scene.name, chunk, max(step, 1), output))
+            for chunk, output in zip(chunks, outputs)
+        ]
+        failed = [p.args for p in processes if p.wait() != 0]
+        if failed:
+            raise Exception('bake worker failed: '+' '.join(failed[0]))
+
+        columns = {channel_key(c): j for j, c in enumerate(channels)}
+        samples = np.full((len(frames), len(channels)), np.nan, dtype=_BAKE_DTYPE)
+        offset = 0
+        for chunk, output in zip(chunks, outputs):
+            with np.load(output) as data:
+                count = len(chunk)
+                if not np.array_equal(data['frames'], chunk):
+                    raise Exception('bake worker frame mismatch: '+output)
+                for k, key in enumerate(data['keys'].tolist()):
+                    j = columns.get(key)
+                    if j is None:
+                        raise Exception('bake worker channel mismatch: '+key)
+                    samples[offset:offset+count, j] = data['samples'][:, k]
+                offset += count
+
+    missing = np.isnan(samples).any(axis=0)
+    if missing.any():
+        raise Exception('bake worker channel missing: '+channel_key(channels[int(np.flatnonzero(missing)[0])]))
+
+    bake_write(channels, frames, samples)
+    if mute:
+        bake_entries(ivd, (c.entry for c in channels))
+    return channels
+# endregion
+
+# region cli
+def main(argv: Union[list[str], None] = None) -> None:
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--')+1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(prog='virtual driver bake')
+    parser.add_argument('--scene', default=None)
+    parser.add_argument('--frame-start', type=int, default=None)
+    parser.add_argument('--frame-end', type=int, default=None)
+    parser.add_argument('--step', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--mute', action='store_true')
+    parser.add_argument('--save', default=None, help='file the baked result is saved to, required unless --worker')
+    parser.add_argument('--worker', action='store_true')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args(argv)
+    if not args.worker and not args.save:
+        parser.error('--save is required, the input file is never overwritten')
+
+    scene = bpy.data.scenes[args.scene] if args.scene else bpy.context.scene
+    frame_start = scene.frame_start if args.frame_start is None else args.frame_start
+    frame_end = scene.frame_end if args.frame_end is None else args.frame_end
+    if args.worker:
+        bake_worker(scene, frame_start, frame_end, args.step, args.output)
+        return
+
+    bake_parallel(scene, frame_start, frame_end, args.step, args.workers, args.mute)
+    bpy.ops.wm.save_as_mainfile(filepath=args.save)
+# endregion
+
+# region operator classes
+class VIRTUALDRIVER_OT_bake(bpy.types.Operator):
+    bl_idname = 'virtual_driver.bake'
+    bl_label = 'bake'
+    bl_description = 'Bake the targets of all valid virtual drivers to keyframes'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    frame_start: bpy.props.IntProperty(
+        name='Start Frame'
+    )
+    frame_end: bpy.props.IntProperty(
+        name='End Frame'
+    )
+    step: bpy.props.IntProperty(
+        name='Frame Step',
+        default=1,
+        min=1
+    )
+    mute: bpy.props.BoolProperty(
+        name='Mute',
+        description='Mute the baked virtual drivers'
+    )
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event) -> set[str]:
+        self.frame_start = context.scene.frame_start
+        self.frame_end = context.scene.frame_end
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context: bpy.types.Context) -> set[str]:
+        props = virtual_driver.get_props_extern(context)
+        if props is None:
+            return {'CANCELLED'}
+        base, vd, ivd, index, block = props
+        if base is None or not ivd or self.frame_end < self.frame_start:
+            return {'CANCELLED'}
+
+        channels = bake(context.scene, base, self.frame_start, self.frame_end, self.step, self.mute)
+        self.report({'INFO'}, 'Baked '+str(len(channels))+' channels')
+        return {'FINISHED'}
+# endregion
+
+# region panel classes
+def bake_panel_draw(self: bpy.types.Panel, context: bpy.types.Context) -> None:
+    self.layout.operator(VIRTUALDRIVER_OT_bake.bl_idname, icon='REC')
+# endregion
+
+# region registration
+classes = (
+    VIRTUALDRIVER_OT_bake,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+    virtual_driver.OBJECT_PT_VirtualDriver.append(bake_panel_draw)
+
+def unregister():
+    virtual_driver.OBJECT_PT_VirtualDriver.remove(bake_panel_draw)
+
+    for cls in classes:
+        bpy.utils.unregister_class(cls)
+# endregion
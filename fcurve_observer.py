@@ -1,23 +1,35 @@
 
+from dataclasses import dataclass
 import enum
-from typing import Union
+from typing import Any, Union
 import bpy
 
 
+# region constants
+_FCURVEOBSERVER_TARGET_ATTRIBUTES: tuple[str, ...] = ('id', 'data_path', 'bone_target', 'transform_type', 'transform_space', 'rotation_mode')
+# endregion
+
 # region property classes
 class FCurveObserver(bpy.types.PropertyGroup):
+    def fcurve_keys(self) -> list[tuple[str, int]]:
+        array_length = getattr(self, 'array_length', 0)
+        if array_length:
+            path = self.path_from_id('prop_array')
+            return [(path, i) for i in range(array_length)]
+        return [(self.path_from_id('prop'), 0)]
+
     def fcurve_update(self, context: bpy.types.Context) -> None:
         try:
-            path = self.path_from_id('prop')
+            keys = self.fcurve_keys()
         except:
             return
-        fcurves = get(self.id_data, path, 0)
-        if fcurves is None:
+        states = query_many(self.id_data, keys)
+        if not any(fcurves for state, fcurves in states.values()):
             if self.fcurve:
                 self.fcurve = False
         else:
             if not self.fcurve:
-                delete(self.id_data, path, 0)
+                delete_many(self.id_data, keys)
 
     fcurve: bpy.props.BoolProperty(
         update=fcurve_update
@@ -38,11 +50,8 @@ class FCurveObserverState(enum.Enum):
     VALID_ONE = 'VALID_ONE'
 
 def get(id: bpy.types.ID, data_path: str, array_index: int) -> Union[bpy.types.FCurve, list[bpy.types.FCurve], None]:
-    state = observer(id, data_path, array_index)
+    state, fcurves = query(id, data_path, array_index)
     if state in (FCurveObserverState.VALID_ONE, FCurveObserverState.VALID_DUPLICATE):
-        anim_data: bpy.types.AnimData = getattr(id, 'animation_data')
-        fcurves: list[bpy.types.FCurve] = anim_data.drivers
-        fcurves = [f for f in fcurves if f.data_path == data_path and f.array_index == array_index]
         return fcurves[0] if state is FCurveObserverState.VALID_ONE else fcurves
     if state in (FCurveObserverState.INPUT_ID, FCurveObserverState.INPUT_DATA_PATH, FCurveObserverState.INPUT_ARRAY_INDEX):
         return
@@ -52,14 +61,13 @@ def get(id: bpy.types.ID, data_path: str, array_index: int) -> Union[bpy.types.F
         return
 
 def delete(id: bpy.types.ID, data_path: str, array_index: int) -> None:
-    state = observer(id, data_path, array_index)
+    state, fcurves = query(id, data_path, array_index)
     if state in (FCurveObserverState.VALID_ONE, FCurveObserverState.VALID_DUPLICATE):
         anim_data: bpy.types.AnimData = getattr(id, 'animation_data')
-        fcurves: list[bpy.types.FCurve] = anim_data.drivers
-        fcurves = [f for f in fcurves if f.data_path == data_path and f.array_index == array_index]
         for fcurve in fcurves:
             anim_data_drivers: bpy.types.AnimDataDrivers = anim_data.drivers
             anim_data_drivers.remove(fcurve)
+        invalidate(id)
         return
     if state in (FCurveObserverState.INPUT_ID, FCurveObserverState.INPUT_DATA_PATH, FCurveObserverState.INPUT_ARRAY_INDEX):
         return
@@ -69,23 +77,207 @@ def delete(id: bpy.types.ID, data_path: str, array_index: int) -> None:
         return
 
 def observer(id: bpy.types.ID, data_path: str, array_index: int) -> FCurveObserverState:
+    return query(id, data_path, array_index)[0]
+
+def query(id: bpy.types.ID, data_path: str, array_index: int) -> tuple[FCurveObserverState, list[bpy.types.FCurve]]:
     if not isinstance(id, bpy.types.ID) or not hasattr(id, 'animation_data'):
-        return FCurveObserverState.INPUT_ID
+        return FCurveObserverState.INPUT_ID, []
     if not isinstance(data_path, str) or data_path == '':
-        return FCurveObserverState.INPUT_DATA_PATH
+        return FCurveObserverState.INPUT_DATA_PATH, []
     if not isinstance(array_index, int) or array_index < 0:
-        return FCurveObserverState.INPUT_ARRAY_INDEX
+        return FCurveObserverState.INPUT_ARRAY_INDEX, []
+    anim_data: Union[bpy.types.AnimData, None] = getattr(id, 'animation_data', None)
+    if anim_data is None:
+        return FCurveObserverState.ANIMATION_DATA, []
+    findex = index(id, anim_data)
+    fcurves = findex.fcurves.get((data_path, array_index), [])
+    if any(f.data_path != data_path or f.array_index != array_index for f in fcurves):
+        invalidate(id)
+        findex = index(id, anim_data)
+        fcurves = findex.fcurves.get((data_path, array_index), [])
+    if not data_path in findex.paths:
+        return FCurveObserverState.DATA_PATH, []
+    if not fcurves:
+        return FCurveObserverState.ARRAY_INDEX, []
+    if len(fcurves) > 1:
+        return FCurveObserverState.VALID_DUPLICATE, fcurves
+    return FCurveObserverState.VALID_ONE, fcurves
+
+def query_many(id: bpy.types.ID, keys: list[tuple[str, int]]) -> dict[tuple[str, int], tuple[FCurveObserverState, list[bpy.types.FCurve]]]:
+    if not isinstance(id, bpy.types.ID) or not hasattr(id, 'animation_data'):
+        return {key: (FCurveObserverState.INPUT_ID, []) for key in keys}
+    anim_data: Union[bpy.types.AnimData, None] = getattr(id, 'animation_data', None)
+    if anim_data is None:
+        return {key: (FCurveObserverState.ANIMATION_DATA, []) for key in keys}
+    findex = index(id, anim_data)
+    res = dict()
+    for key in keys:
+        data_path, array_index = key
+        if not isinstance(data_path, str) or data_path == '':
+            res[key] = FCurveObserverState.INPUT_DATA_PATH, []
+            continue
+        if not isinstance(array_index, int) or array_index < 0:
+            res[key] = FCurveObserverState.INPUT_ARRAY_INDEX, []
+            continue
+        fcurves = findex.fcurves.get(key, [])
+        if not data_path in findex.paths:
+            res[key] = FCurveObserverState.DATA_PATH, []
+        elif not fcurves:
+            res[key] = FCurveObserverState.ARRAY_INDEX, []
+        elif len(fcurves) > 1:
+            res[key] = FCurveObserverState.VALID_DUPLICATE, fcurves
+        else:
+            res[key] = FCurveObserverState.VALID_ONE, fcurves
+    return res
+
+def delete_many(id: bpy.types.ID, keys: list[tuple[str, int]]) -> None:
+    fcurves = [f for state, fs in query_many(id, keys).values() for f in fs]
+    if not fcurves:
+        return
+    anim_data: bpy.types.AnimData = getattr(id, 'animation_data')
+    anim_data_drivers: bpy.types.AnimDataDrivers = anim_data.drivers
+    for fcurve in fcurves:
+        anim_data_drivers.remove(fcurve)
+    invalidate(id)
+# endregion
+
+# region index
+@dataclass
+class FCurveIndex:
+    count: int
+    generation: int
+    paths: set[str]
+    fcurves: dict[tuple[str, int], list[bpy.types.FCurve]]
+    revision: int = 0
+    stale: bool = False
+
+_FCURVEOBSERVER_INDEX: dict[tuple[int, int], FCurveIndex] = dict()
+_FCURVEOBSERVER_GENERATION: int = 0
+_FCURVEOBSERVER_REVISION: int = 0
+
+def index_key(id: bpy.types.ID) -> tuple[int, int]:
+    return id.as_pointer(), getattr(id, 'session_uid', 0)
+
+def index(id: bpy.types.ID, anim_data: bpy.types.AnimData) -> FCurveIndex:
+    global _FCURVEOBSERVER_REVISION
+    key = index_key(id)
+    drivers: list[bpy.types.FCurve] = anim_data.drivers
+    count = len(drivers)
+    previous = _FCURVEOBSERVER_INDEX.get(key)
+    if not previous is None and not previous.stale and previous.count == count and previous.generation == _FCURVEOBSERVER_GENERATION:
+        return previous
+
+    res = FCurveIndex(count, _FCURVEOBSERVER_GENERATION, set(), dict())
+    for f in drivers:
+        res.paths.add(f.data_path)
+        res.fcurves.setdefault((f.data_path, f.array_index), []).append(f)
+    if previous is None or previous.generation != res.generation or index_pointers(previous) != index_pointers(res):
+        _FCURVEOBSERVER_REVISION += 1
+        res.revision = _FCURVEOBSERVER_REVISION
+    else:
+        res.revision = previous.revision
+    _FCURVEOBSERVER_INDEX[key] = res
+    return res
+
+def index_pointers(findex: FCurveIndex) -> dict[tuple[str, int], list[int]]:
+    return {key: [f.as_pointer() for f in fcurves] for key, fcurves in findex.fcurves.items()}
+
+def revision(id: bpy.types.ID) -> int:
     anim_data: Union[bpy.types.AnimData, None] = getattr(id, 'animation_data', None)
     if anim_data is None:
-        return FCurveObserverState.ANIMATION_DATA
-    fcurves: list[bpy.types.FCurve] = anim_data.drivers
-    pfcurves = [f for f in fcurves if f.data_path == data_path]
-    if not pfcurves:
-        return FCurveObserverState.DATA_PATH
-    ifcurves = [f for f in pfcurves if f.array_index == array_index]
-    if not ifcurves:
-        return FCurveObserverState.ARRAY_INDEX
-    if len(ifcurves) > 1:
-        return FCurveObserverState.VALID_DUPLICATE
-    return FCurveObserverState.VALID_ONE
+        return 0
+    return index(id, anim_data).revision
+
+def invalidate(id: Union[bpy.types.ID, None] = None) -> None:
+    global _FCURVEOBSERVER_GENERATION
+    if id is None:
+        _FCURVEOBSERVER_GENERATION += 1
+        _FCURVEOBSERVER_INDEX.clear()
+        return
+    _FCURVEOBSERVER_INDEX.pop(index_key(id), None)
+
+def invalidate_ids(ptrs: set[int]) -> None:
+    if not ptrs:
+        return
+    for key, res in _FCURVEOBSERVER_INDEX.items():
+        if key[0] in ptrs:
+            res.stale = True
+# endregion
+
+# region drivers
+def struct_fingerprint(data: bpy.types.bpy_struct) -> tuple:
+    res = []
+    for prop in data.bl_rna.properties:
+        if prop.type in ('POINTER', 'COLLECTION') or prop.identifier == 'rna_type':
+            continue
+        value = getattr(data, prop.identifier)
+        res.append((prop.identifier, tuple(value) if getattr(prop, 'is_array', False) else value))
+    return tuple(res)
+
+def target_fingerprint(target: bpy.types.DriverTarget) -> tuple:
+    return (
+        target.id.as_pointer() if target.id else None,
+        target.id_type,
+        target.data_path,
+        target.bone_target,
+        target.transform_type,
+        target.transform_space,
+        target.rotation_mode
+    )
+
+def fingerprint(fcurve: bpy.types.FCurve) -> tuple:
+    driver: bpy.types.Driver = fcurve.driver
+    co = [0.0]*(len(fcurve.keyframe_points)*2)
+    fcurve.keyframe_points.foreach_get('co', co)
+    return (
+        fcurve.mute,
+        driver.type,
+        driver.expression,
+        driver.use_self,
+        tuple((v.name, v.type, tuple(target_fingerprint(t) for t in v.targets)) for v in driver.variables),
+        tuple(struct_fingerprint(m) for m in fcurve.modifiers),
+        tuple(co)
+    )
+
+def patch_attribute(data: bpy.types.bpy_struct, name: str, value: Any) -> None:
+    if getattr(data, name) != value:
+        setattr(data, name, value)
+
+def patch(src: bpy.types.FCurve, dst: bpy.types.FCurve) -> bool:
+    sdriver: bpy.types.Driver = src.driver
+    ddriver: bpy.types.Driver = dst.driver
+    if len(sdriver.variables) != len(ddriver.variables):
+        return False
+    if len(src.keyframe_points) or len(dst.keyframe_points):
+        return False
+    if tuple(struct_fingerprint(m) for m in src.modifiers) != tuple(struct_fingerprint(m) for m in dst.modifiers):
+        return False
+
+    for svariable, dvariable in zip(sdriver.variables, ddriver.variables):
+        patch_attribute(dvariable, 'name', svariable.name)
+        patch_attribute(dvariable, 'type', svariable.type)
+        if len(svariable.targets) != len(dvariable.targets):
+            return False
+        for starget, dtarget in zip(svariable.targets, dvariable.targets):
+            if dvariable.type == 'SINGLE_PROP':
+                patch_attribute(dtarget, 'id_type', starget.id_type)
+            for attribute in _FCURVEOBSERVER_TARGET_ATTRIBUTES:
+                patch_attribute(dtarget, attribute, getattr(starget, attribute))
+    patch_attribute(ddriver, 'type', sdriver.type)
+    patch_attribute(ddriver, 'expression', sdriver.expression)
+    patch_attribute(ddriver, 'use_self', sdriver.use_self)
+    patch_attribute(dst, 'mute', src.mute)
+    return True
+
+def sources(fcurve: bpy.types.FCurve) -> list[tuple[bpy.types.ID, str, str]]:
+    driver: Union[bpy.types.Driver, None] = getattr(fcurve, 'driver', None)
+    if driver is None:
+        return []
+    res = []
+    for variable in driver.variables:
+        for target in variable.targets:
+            if target.id is None:
+                continue
+            res.append((target.id, target.data_path, variable.type))
+    return res
 # endregion
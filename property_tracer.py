@@ -1,6 +1,8 @@
 
+from dataclasses import dataclass
 import enum
-from typing import Any, Callable, Literal, Union
+import math
+from typing import Any, Callable, Iterable, Literal, Union
 import bpy
 from . import utils
 
@@ -9,6 +11,7 @@ from . import utils
 _PROPTRACE_BASE_TYPE: bpy.types.bpy_struct = None
 _PROPTRACE_BASE_ACCESS_CONTEXT: Callable[[bpy.types.Context, bool], Union[bpy.types.bpy_struct, list[bpy.types.bpy_struct], None]] = None
 _PROPTRACE_BASE_PATHS: dict[str, bpy.props._PropertyDeferred] = dict()
+_PROPTRACE_MIRROR: bool = True
 
 _PROPTRACE_ID_TYPE_STR: list[tuple[str, str, str, str, int]] = [
     ('ACTION', 'Action', '', 'ACTION', 17217),
@@ -91,47 +94,163 @@ _PROPTRACE_ID_TYPE_PYTYPE: dict[str, bpy.types.ID] = {
     'WORLD': bpy.types.World,
     'WORKSPACE': bpy.types.WorkSpace,
 }
+
+_PROPTRACE_ID_TYPE_VALUES: dict[str, int] = {i[0]: i[4] for i in _PROPTRACE_ID_TYPE_STR}
+_PROPTRACE_ID_TYPE_IDENTIFIERS: dict[int, str] = {i[4]: i[0] for i in _PROPTRACE_ID_TYPE_STR}
+
+_PROPTRACE_BINDING_IDENTIFIERS: set[str] = {'id_type', 'id', 'data_path'}
+_PROPTRACE_ARRAY_SIZE: int = 32
+
+_PROPTRACE_PROP_TYPES: list[tuple[str, str, str]] = [
+    ('FLOAT', 'Float', ''),
+    ('INT', 'Integer', ''),
+    ('BOOLEAN', 'Boolean', ''),
+    ('ENUM', 'Enum', '')
+]
+_PROPTRACE_PROP_SLOTS: dict[str, str] = {
+    'FLOAT': 'prop',
+    'INT': 'prop_int',
+    'BOOLEAN': 'prop_bool',
+    'ENUM': 'prop_enum'
+}
+_PROPTRACE_UNBOUNDED: dict[str, float] = {
+    'FLOAT': 3.4e38,
+    'INT': 2**31-1
+}
+# endregion
+
+# region property polls
+def id_poll(self: bpy.types.PropertyGroup, id: bpy.types.ID) -> bool:
+    pytype = _PROPTRACE_ID_TYPE_PYTYPE.get(self.id_type)
+    return not pytype is None and isinstance(id, pytype)
+
+def id_type_enum_get(self: bpy.types.PropertyGroup) -> int:
+    return _PROPTRACE_ID_TYPE_VALUES.get(self.id_type, _PROPTRACE_ID_TYPE_VALUES['OBJECT'])
+
+def id_type_enum_set(self: bpy.types.PropertyGroup, value: int) -> None:
+    self.id_type = _PROPTRACE_ID_TYPE_IDENTIFIERS[value]
+# endregion
+
+# region value slots
+def prop_type(property: bpy.types.Property) -> str:
+    if property.type == 'ENUM':
+        return 'INT' if property.is_enum_flag else 'ENUM'
+    if property.type in ('INT', 'BOOLEAN'):
+        return property.type
+    return 'FLOAT'
+
+def prop_slot(data: bpy.types.PropertyGroup) -> str:
+    return _PROPTRACE_PROP_SLOTS[data.prop_type]
+
+def source_accessor(data: bpy.types.PropertyGroup) -> Union[utils.Accessor, None]:
+    accs = utils.accessors(data.id, data.data_path)
+    return accs[0] if accs else None
+
+def source_clamp(data: bpy.types.PropertyGroup, value: float) -> float:
+    acc = source_accessor(data)
+    if acc is None or not acc.prop.type in ('FLOAT', 'INT'):
+        return value
+    return min(max(value, acc.prop.hard_min), acc.prop.hard_max)
+
+def source_range(data: bpy.types.PropertyGroup) -> Union[tuple[float, float], None]:
+    acc = source_accessor(data)
+    if acc is None or not acc.prop.type in _PROPTRACE_UNBOUNDED:
+        return
+    limit = _PROPTRACE_UNBOUNDED[acc.prop.type]
+    soft_min, soft_max = acc.prop.soft_min, acc.prop.soft_max
+    if soft_min <= -limit and soft_max >= limit:
+        return
+    return (-math.inf if soft_min <= -limit else soft_min), (math.inf if soft_max >= limit else soft_max)
+
+def prop_int_get(self: bpy.types.PropertyGroup) -> int:
+    return int(self.prop)
+
+def prop_int_set(self: bpy.types.PropertyGroup, value: int) -> None:
+    self.prop = source_clamp(self, value)
+
+def prop_bool_get(self: bpy.types.PropertyGroup) -> bool:
+    return self.prop != 0
+
+def prop_bool_set(self: bpy.types.PropertyGroup, value: bool) -> None:
+    self.prop = float(value)
+
+def prop_enum_items(self: bpy.types.PropertyGroup, context: bpy.types.Context) -> list[tuple[str, str, str, str, int]]:
+    acc = source_accessor(self)
+    if acc is None or acc.prop.type != 'ENUM':
+        return []
+    return utils.enum_items(acc.prop, acc.owner)
+
+def prop_enum_get(self: bpy.types.PropertyGroup) -> int:
+    return int(self.prop)
+
+def prop_enum_set(self: bpy.types.PropertyGroup, value: int) -> None:
+    self.prop = value
 # endregion
 
 # region property classes
+class PropTraceTarget(bpy.types.PropertyGroup):
+    def target_update(self, context: bpy.types.Context) -> None:
+        utils.accessor_invalidate(self.id, self.data_path)
+        self.is_valid = bool(utils.accessors(self.id, self.data_path))
+        owner = owner_resolve(self)
+        if owner is None:
+            return
+        base, index, target = owner
+        trace_index_update(base, getattr(base, InternalPropTrace.identifier)[index], 'id')
+
+    id_type: bpy.props.EnumProperty(
+        items=_PROPTRACE_ID_TYPE_STR,
+        name='ID Type',
+        description='Type of ID-block that can be used',
+        default='OBJECT',
+        update=target_update
+    )
+    id: bpy.props.PointerProperty(
+        type=bpy.types.ID,
+        name='ID',
+        description='ID-Block that the specific property used can be found drom (id_type property must be set first).',
+        poll=id_poll,
+        update=target_update
+    )
+    data_path: bpy.props.StringProperty(
+        name='Data Path',
+        description='RNA Path (from ID-Block) to property used, may contain wildcards in collection keys.',
+        update=target_update
+    )
+    is_valid: bpy.props.BoolProperty()
+
 class PropertyTracer(bpy.types.PropertyGroup):
     identifier: Literal['property_tracer'] = 'property_tracer'
 
     def is_valid_update(self, context: bpy.types.Context) -> None:
         if not self.is_valid:
             return
-        anim = utils.animatable(self.id, self.data_path)
-        if anim is None:
+        accs = utils.accessors(self.id, self.data_path)
+        if not accs:
             self.is_valid = False
             return
-        self.__class__.prop = utils.copy_anim_property(
-            anim.prop,
-            lambda self, context: property_tracer_update(self, context, 'prop')
-        )
-        if anim.array_index is None:
-            self.prop = getattr(anim.id.path_resolve(anim.rna_path) if anim.rna_path else anim.id, anim.prop_path)
+        acc = accs[0]
+        self.prop_type = prop_type(acc.prop)
+        self.array_length = acc.length
+        if acc.is_vector:
+            self.prop_array[:acc.length] = acc.get()
         else:
-            self.prop = getattr(anim.id.path_resolve(anim.rna_path) if anim.rna_path else anim.id, anim.prop_path)[anim.array_index]
+            self.prop = acc.number()
         property_tracer_update(self, context, 'is_valid')
 
     def id_type_update(self, context: bpy.types.Context) -> None:
-        def id_update(self: PropertyTracer, context: bpy.types.Context) -> None:
-            anim = utils.animatable(self.id, self.data_path)
-            self.is_valid = not anim is None
-            property_tracer_update(self, context, 'id')
-
-        self.id = None
-        self.__class__.id = bpy.props.PointerProperty(
-            type=_PROPTRACE_ID_TYPE_PYTYPE[self.id_type],
-            name='ID',
-            description='ID-Block that the specific property used can be found drom (id_type property must be set first).',
-            update=id_update
-        )
+        if not self.id is None and not id_poll(self, self.id):
+            self.id = None
         property_tracer_update(self, context, 'id_type')
 
+    def id_update(self, context: bpy.types.Context) -> None:
+        utils.accessor_invalidate(self.id, self.data_path)
+        self.is_valid = bool(utils.accessors(self.id, self.data_path))
+        property_tracer_update(self, context, 'id')
+
     def data_path_update(self, context: bpy.types.Context) -> None:
-        anim = utils.animatable(self.id, self.data_path)
-        self.is_valid = not anim is None
+        utils.accessor_invalidate(self.id, self.data_path)
+        self.is_valid = bool(utils.accessors(self.id, self.data_path))
         property_tracer_update(self, context, 'data_path')
 
     name: bpy.props.StringProperty(
@@ -150,7 +269,13 @@ class PropertyTracer(bpy.types.PropertyGroup):
         update=id_type_update
     )
 
-    id: bpy.props.PointerProperty(type=bpy.types.ID)
+    id: bpy.props.PointerProperty(
+        type=bpy.types.ID,
+        name='ID',
+        description='ID-Block that the specific property used can be found drom (id_type property must be set first).',
+        poll=id_poll,
+        update=id_update
+    )
 
     data_path: bpy.props.StringProperty(
         name='Data Path',
@@ -158,7 +283,42 @@ class PropertyTracer(bpy.types.PropertyGroup):
         update=data_path_update
     )
 
-    prop: bpy.props.FloatProperty()
+    prop: bpy.props.FloatProperty(
+        update=lambda self, context: property_tracer_update(self, context, 'prop')
+    )
+    prop_type: bpy.props.EnumProperty(
+        items=_PROPTRACE_PROP_TYPES,
+        name='Value Type'
+    )
+    prop_int: bpy.props.IntProperty(
+        name='Value',
+        options=set(),
+        get=prop_int_get,
+        set=prop_int_set
+    )
+    prop_bool: bpy.props.BoolProperty(
+        name='Value',
+        options=set(),
+        get=prop_bool_get,
+        set=prop_bool_set
+    )
+    prop_enum: bpy.props.EnumProperty(
+        name='Value',
+        items=prop_enum_items,
+        options=set(),
+        get=prop_enum_get,
+        set=prop_enum_set
+    )
+
+    array_length: bpy.props.IntProperty(
+        min=0,
+        max=_PROPTRACE_ARRAY_SIZE,
+        update=lambda self, context: property_tracer_update(self, context, 'array_length')
+    )
+    prop_array: bpy.props.FloatVectorProperty(
+        size=_PROPTRACE_ARRAY_SIZE,
+        update=lambda self, context: property_tracer_update(self, context, 'prop_array')
+    )
 
 class InternalPropTrace(bpy.types.PropertyGroup):
     identifier: Literal['internal_prop_trace'] = 'internal_prop_trace'
@@ -166,28 +326,31 @@ class InternalPropTrace(bpy.types.PropertyGroup):
     def is_valid_update(self, context: bpy.types.Context) -> None:
         if not self.is_valid:
             return
-        anim = utils.animatable(self.id, self.data_path)
-        if anim is None:
+        accs = utils.accessors(self.id, self.data_path)
+        if not accs:
             self.is_valid = False
             return
-        if anim.array_index is None:
-            self.prop = getattr(anim.id.path_resolve(anim.rna_path) if anim.rna_path else anim.id, anim.prop_path)
+        acc = accs[0]
+        self.prop_type = prop_type(acc.prop)
+        self.array_length = acc.length
+        if acc.is_vector:
+            self.prop_array[:acc.length] = acc.get()
         else:
-            self.prop = getattr(anim.id.path_resolve(anim.rna_path) if anim.rna_path else anim.id, anim.prop_path)[anim.array_index]
+            self.prop = acc.number()
         internal_prop_trace_update(self, context, 'is_valid')
 
     def id_type_update(self, context: bpy.types.Context) -> None:
-        self.is_valid = isinstance(self.id, _PROPTRACE_ID_TYPE_PYTYPE[self.id_type])
+        self.is_valid = id_poll(self, self.id)
         internal_prop_trace_update(self, context, 'id_type')
 
     def id_update(self, context: bpy.types.Context) -> None:
-        anim = utils.animatable(self.id, self.data_path)
-        self.is_valid = not anim is None
+        utils.accessor_invalidate(self.id, self.data_path)
+        self.is_valid = bool(utils.accessors(self.id, self.data_path))
         internal_prop_trace_update(self, context, 'id')
 
     def data_path_update(self, context: bpy.types.Context) -> None:
-        anim = utils.animatable(self.id, self.data_path)
-        self.is_valid = not anim is None
+        utils.accessor_invalidate(self.id, self.data_path)
+        self.is_valid = bool(utils.accessors(self.id, self.data_path))
         internal_prop_trace_update(self, context, 'data_path')
 
     name: bpy.props.StringProperty(
@@ -200,8 +363,18 @@ class InternalPropTrace(bpy.types.PropertyGroup):
     id_type: bpy.props.StringProperty(
         update=id_type_update
     )
+    id_type_enum: bpy.props.EnumProperty(
+        items=_PROPTRACE_ID_TYPE_STR,
+        name='ID Type',
+        description='Type of ID-block that can be used',
+        get=id_type_enum_get,
+        set=id_type_enum_set
+    )
     id: bpy.props.PointerProperty(
         type=bpy.types.ID,
+        name='ID',
+        description='ID-Block that the specific property used can be found drom (id_type property must be set first).',
+        poll=id_poll,
         update=id_update
     )
     data_path: bpy.props.StringProperty(
@@ -210,6 +383,41 @@ class InternalPropTrace(bpy.types.PropertyGroup):
     prop: bpy.props.FloatProperty(
         update=lambda self, context: internal_prop_trace_update(self, context, 'prop')
     )
+    prop_type: bpy.props.EnumProperty(
+        items=_PROPTRACE_PROP_TYPES,
+        name='Value Type'
+    )
+    prop_int: bpy.props.IntProperty(
+        name='Value',
+        options=set(),
+        get=prop_int_get,
+        set=prop_int_set
+    )
+    prop_bool: bpy.props.BoolProperty(
+        name='Value',
+        options=set(),
+        get=prop_bool_get,
+        set=prop_bool_set
+    )
+    prop_enum: bpy.props.EnumProperty(
+        name='Value',
+        items=prop_enum_items,
+        options=set(),
+        get=prop_enum_get,
+        set=prop_enum_set
+    )
+    array_length: bpy.props.IntProperty(
+        min=0,
+        max=_PROPTRACE_ARRAY_SIZE,
+        update=lambda self, context: internal_prop_trace_update(self, context, 'array_length')
+    )
+    prop_array: bpy.props.FloatVectorProperty(
+        size=_PROPTRACE_ARRAY_SIZE,
+        update=lambda self, context: internal_prop_trace_update(self, context, 'prop_array')
+    )
+    targets: bpy.props.CollectionProperty(
+        type=PropTraceTarget
+    )
 
 class InternalPropTraceIndex:
     identifier: Literal['active_internal_prop_trace_index'] = 'active_internal_prop_trace_index'
@@ -252,13 +460,16 @@ def property_tracer_update(self: PropertyTracer, context: bpy.types.Context, ide
 
 def internal_prop_trace_update(self: InternalPropTrace, context: bpy.types.Context, identifier: str) -> None:
     global _PROPTRACE_TRACE_MODE
-    if _PROPTRACE_TRACE_MODE is TraceMode.panel:
-        return
-
     props = get_props_intern(self)
     if props is None:
         return
     base, pt, ipt, index, block = props
+    trace_index_update(base, self, identifier)
+
+    if not _PROPTRACE_MIRROR:
+        return
+    if _PROPTRACE_TRACE_MODE is TraceMode.panel:
+        return
     if block is None:
         return
 
@@ -271,6 +482,8 @@ def internal_prop_trace_update(self: InternalPropTrace, context: bpy.types.Conte
 
 def internal_prop_trace_index_update(self: bpy.types.bpy_struct, context: bpy.types.Context) -> None:
     global _PROPTRACE_TRACE_MODE
+    if not _PROPTRACE_MIRROR:
+        return
     if _PROPTRACE_TRACE_MODE is TraceMode.panel:
         return
 
@@ -289,10 +502,158 @@ def internal_prop_trace_index_update(self: bpy.types.bpy_struct, context: bpy.ty
     trace(pt, 'id_type', block)
     trace(pt, 'id', block, True, temp_id)
     trace(pt, 'data_path', block)
+    trace(pt, 'prop_type', block)
+    trace(pt, 'array_length', block)
     trace(pt, 'prop', block)
+    trace(pt, 'prop_array', block)
     _PROPTRACE_TRACE_MODE = TraceMode.none
 # endregion
 
+# region trace index
+@dataclass
+class TraceIndex:
+    ids: dict[int, list[int]]
+    owners: dict[int, list[int]]
+    paths: list[list[tuple[bpy.types.ID, str]]]
+
+_PROPTRACE_TRACE_INDEX: dict[int, TraceIndex] = dict()
+_PROPTRACE_TRACE_PENDING: dict[int, set[int]] = dict()
+
+def bindings(block: InternalPropTrace) -> list[utils.Accessor]:
+    res = utils.accessors(block.id, block.data_path)
+    for target in block.targets:
+        res.extend(utils.accessors(target.id, target.data_path))
+    return res
+
+def trace_index_build(ipt: list[InternalPropTrace]) -> TraceIndex:
+    res = TraceIndex(dict(), dict(), [])
+    for i, b in enumerate(ipt):
+        paths = [(b.id, b.data_path), *((t.id, t.data_path) for t in b.targets)]
+        res.paths.append(paths)
+        for ptr in {id.as_pointer() for id, path in paths if id}:
+            res.ids.setdefault(ptr, []).append(i)
+        for ptr in {acc.owner.as_pointer() for id, path in paths for acc in utils.accessors(id, path)}:
+            res.owners.setdefault(ptr, []).append(i)
+    return res
+
+def trace_index_get(base: bpy.types.bpy_struct, ipt: list[InternalPropTrace]) -> TraceIndex:
+    key = base.as_pointer()
+    res = _PROPTRACE_TRACE_INDEX.get(key)
+    if res is None:
+        res = trace_index_build(ipt)
+        _PROPTRACE_TRACE_INDEX[key] = res
+    return res
+
+def trace_index_query(base: bpy.types.bpy_struct, ipt: list[InternalPropTrace], ptrs: Iterable[int]) -> set[int]:
+    tindex = trace_index_get(base, ipt)
+    res = set()
+    for ptr in ptrs:
+        res.update(tindex.ids.get(ptr, ()))
+        res.update(tindex.owners.get(ptr, ()))
+    return res
+
+def trace_index_bindings(base: bpy.types.bpy_struct, ipt: list[InternalPropTrace], index: int) -> list[utils.Accessor]:
+    tindex = trace_index_get(base, ipt)
+    if index >= len(tindex.paths):
+        return bindings(ipt[index])
+    res = []
+    try:
+        for id, path in tindex.paths[index]:
+            res.extend(utils.accessors(id, path))
+    except ReferenceError:
+        trace_index_invalidate(base)
+        return bindings(ipt[index])
+    return res
+
+def trace_index_invalidate(base: Union[bpy.types.bpy_struct, None] = None) -> None:
+    if base is None:
+        _PROPTRACE_TRACE_INDEX.clear()
+        _PROPTRACE_TRACE_PENDING.clear()
+        return
+    _PROPTRACE_TRACE_INDEX.pop(base.as_pointer(), None)
+
+def trace_index_touch(base: bpy.types.bpy_struct, index: int) -> None:
+    _PROPTRACE_TRACE_PENDING.setdefault(base.as_pointer(), set()).add(index)
+
+def trace_index_pending(base: bpy.types.bpy_struct) -> set[int]:
+    return _PROPTRACE_TRACE_PENDING.pop(base.as_pointer(), set())
+
+def trace_index_touched(base: bpy.types.bpy_struct) -> set[int]:
+    return _PROPTRACE_TRACE_PENDING.get(base.as_pointer(), set())
+
+def trace_index_settle(base: bpy.types.bpy_struct) -> None:
+    _PROPTRACE_TRACE_PENDING.pop(base.as_pointer(), None)
+
+def trace_index_has_pending() -> bool:
+    return any(_PROPTRACE_TRACE_PENDING.values())
+
+def trace_index_update(base: Union[bpy.types.bpy_struct, None], block: InternalPropTrace, identifier: str) -> None:
+    if base is None:
+        return
+    if identifier in _PROPTRACE_BINDING_IDENTIFIERS:
+        trace_index_invalidate(base)
+    trace_index_touch(base, block.index)
+# endregion
+
+# region owner map
+_PROPTRACE_OWNERS: dict[int, tuple[bpy.types.bpy_struct, int, int]] = dict()
+_PROPTRACE_OWNER_KEYS: dict[int, list[int]] = dict()
+
+def owner_struct(base: bpy.types.bpy_struct, index: int, target: int) -> bpy.types.bpy_struct:
+    if index == -2:
+        return base
+    if index == -1:
+        return getattr(base, PropertyTracer.identifier)
+    block: InternalPropTrace = getattr(base, InternalPropTrace.identifier)[index]
+    return block if target < 0 else block.targets[target]
+
+def owner_register(base: bpy.types.bpy_struct) -> None:
+    owner_invalidate(base)
+    entries = [(base, -2, -1)]
+    if not getattr(base, PropertyTracer.identifier, None) is None:
+        entries.append((base, -1, -1))
+    for i, block in enumerate(getattr(base, InternalPropTrace.identifier, ())):
+        entries.append((base, i, -1))
+        entries.extend((base, i, j) for j in range(len(block.targets)))
+    keys = _PROPTRACE_OWNER_KEYS.setdefault(base.as_pointer(), [])
+    for entry in entries:
+        ptr = owner_struct(*entry).as_pointer()
+        _PROPTRACE_OWNERS[ptr] = entry
+        keys.append(ptr)
+
+def owner_base(data: bpy.types.bpy_struct) -> Union[bpy.types.bpy_struct, None]:
+    if isinstance(data, PropTraceTarget):
+        path = data.path_from_id()
+        return owner_base(data.id_data.path_resolve(path[:path.rindex('.')]))
+    ip = utils.path_recognize(data.id_data, data.path_from_id())
+    if ip is None:
+        return
+    return ip.id.path_resolve(ip.rna_path) if ip.rna_path else ip.id
+
+def owner_resolve(data: bpy.types.bpy_struct) -> Union[tuple[bpy.types.bpy_struct, int, int], None]:
+    ptr = data.as_pointer()
+    res = _PROPTRACE_OWNERS.get(ptr)
+    if not res is None:
+        try:
+            if owner_struct(*res).as_pointer() == ptr:
+                return res
+        except Exception as _:
+            pass
+    base = owner_base(data)
+    if base is None:
+        return
+    owner_register(base)
+    return _PROPTRACE_OWNERS.get(ptr)
+
+def owner_invalidate(base: Union[bpy.types.bpy_struct, None] = None) -> None:
+    if base is None:
+        _PROPTRACE_OWNERS.clear()
+        _PROPTRACE_OWNER_KEYS.clear()
+        return
+    for ptr in _PROPTRACE_OWNER_KEYS.pop(base.as_pointer(), ()):
+        _PROPTRACE_OWNERS.pop(ptr, None)
+# endregion
+
 # region operator classes
 class PROPTRACE_OT_add(bpy.types.Operator):
     bl_idname = 'prop_trace.add'
@@ -317,6 +678,8 @@ class PROPTRACE_OT_add(bpy.types.Operator):
         if base is None:
             return {'CANCELLED'}
 
+        trace_index_invalidate(base)
+        owner_invalidate(base)
         block: InternalPropTrace = ipt.add()
         length = len(ipt)
         block.name = 'Property '+str(length)
@@ -352,6 +715,8 @@ class PROPTRACE_OT_remove(bpy.types.Operator):
         if not ipt or index < 0:
             return {'CANCELLED'}
 
+        trace_index_invalidate(base)
+        owner_invalidate(base)
         block = ipt[index]
         ipt.remove(index)
 
@@ -361,6 +726,47 @@ class PROPTRACE_OT_remove(bpy.types.Operator):
             b.index -= 1
         setattr(base, InternalPropTraceIndex.identifier, min(max(0, index), len(ipt)-1))
         return {'FINISHED'}
+
+class PROPTRACE_OT_target_add(bpy.types.Operator):
+    bl_idname = 'prop_trace.target_add'
+    bl_label = 'add target'
+    bl_description = ''
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context: bpy.types.Context) -> set[str]:
+        props = get_props_extern(context)
+        if props is None:
+            return {'CANCELLED'}
+        base, pt, ipt, index, block = props
+        if block is None:
+            return {'CANCELLED'}
+
+        owner_invalidate(base)
+        target: PropTraceTarget = block.targets.add()
+        target.id_type = 'OBJECT'
+        trace_index_update(base, block, 'id')
+        return {'FINISHED'}
+
+class PROPTRACE_OT_target_remove(bpy.types.Operator):
+    bl_idname = 'prop_trace.target_remove'
+    bl_label = 'remove target'
+    bl_description = ''
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index: bpy.props.IntProperty()
+
+    def execute(self, context: bpy.types.Context) -> set[str]:
+        props = get_props_extern(context)
+        if props is None:
+            return {'CANCELLED'}
+        base, pt, ipt, index, block = props
+        if block is None or not 0 <= self.index < len(block.targets):
+            return {'CANCELLED'}
+
+        owner_invalidate(base)
+        block.targets.remove(self.index)
+        trace_index_update(base, block, 'id')
+        return {'FINISHED'}
 # endregion
 
 # region property accesses
@@ -397,10 +803,10 @@ def get_props_intern(
         if isinstance(data, bpy.types.ID):
             base = data
         else:
-            ip = utils.path_recognize(data.id_data, data.path_from_id())
-            if ip is None:
+            owner = owner_resolve(data)
+            if owner is None:
                 return
-            base = ip.id.path_resolve(ip.rna_path) if ip.rna_path else ip.id
+            base = owner[0]
         return get_props_sub(base)
     except Exception as _:
         return
@@ -456,18 +862,23 @@ base_paths = {
 
 def preregister(
     base_type: bpy.types.bpy_struct = base_type,
-    base_access_context: Callable[[bpy.types.Context, bool], Union[bpy.types.bpy_struct, list[bpy.types.bpy_struct], None]] = base_access_context
+    base_access_context: Callable[[bpy.types.Context, bool], Union[bpy.types.bpy_struct, list[bpy.types.bpy_struct], None]] = base_access_context,
+    mirror: bool = True
 ) -> None:
-    global _PROPTRACE_BASE_TYPE, _PROPTRACE_BASE_ACCESS_CONTEXT, _PROPTRACE_BASE_PATHS
+    global _PROPTRACE_BASE_TYPE, _PROPTRACE_BASE_ACCESS_CONTEXT, _PROPTRACE_BASE_PATHS, _PROPTRACE_MIRROR
     _PROPTRACE_BASE_TYPE = base_type
     _PROPTRACE_BASE_ACCESS_CONTEXT = base_access_context
     _PROPTRACE_BASE_PATHS = base_paths
+    _PROPTRACE_MIRROR = mirror
 
 classes = (
+    PropTraceTarget,
     PropertyTracer,
     InternalPropTrace,
     PROPTRACE_OT_add,
-    PROPTRACE_OT_remove
+    PROPTRACE_OT_remove,
+    PROPTRACE_OT_target_add,
+    PROPTRACE_OT_target_remove
 )
 
 def register():
@@ -1,5 +1,7 @@
 
+from collections import OrderedDict
 from dataclasses import dataclass
+import fnmatch
 import re
 from typing import Any, Callable, Literal, Pattern, Union
 import bpy
@@ -7,10 +9,16 @@ import bpy
 
 # region constants
 _PROPTRACE_RE_PATH_DISASSEMBLY: Pattern = re.compile(r'''(\[(?:(?P<str>".*?(?<!\\)")|(?P<int>\d+))\])|(?(1)|(?P<path>\w+))''')
+_PROPTRACE_RE_PATH_UNESCAPE: Pattern = re.compile(r'''\\(.)''')
+_PROPTRACE_DISASSEMBLY_CACHE_SIZE: int = 1024
+_PROPTRACE_RECOGNITION_CACHE_SIZE: int = 1024
+_PROPTRACE_ARRAY_MAX_LENGTH: int = 32
+_PROPTRACE_EXPANSION_CACHE_SIZE: int = 256
+_PROPTRACE_WILDCARD_CHARS: tuple[str, ...] = ('*', '?')
 # endregion
 
 # region dataclasses
-@dataclass
+@dataclass(frozen=True)
 class DisassemblyItem:
     type: Union[Literal['path'], Literal['int'], Literal['str']]
     path: Union[str, int, None]
@@ -30,10 +38,149 @@ class Interpretation:
     prop_path: str
     array_index: Union[int, None]
     prop: bpy.types.Property
+
+@dataclass
+class Accessor:
+    id: bpy.types.ID
+    owner: bpy.types.bpy_struct
+    prop_path: str
+    array_index: Union[int, None]
+    prop: bpy.types.Property
+    collection: Union[bpy.types.bpy_prop_collection, None] = None
+    collection_path: str = ''
+    item_index: int = -1
+    rna_path: str = ''
+
+    @property
+    def is_vector(self) -> bool:
+        return self.array_index is None and getattr(self.prop, 'is_array', False)
+
+    @property
+    def length(self) -> int:
+        return self.prop.array_length if self.is_vector else 0
+
+    def get(self) -> Any:
+        if self.is_vector:
+            return tuple(getattr(self.owner, self.prop_path))
+        if self.array_index is None:
+            return getattr(self.owner, self.prop_path)
+        return getattr(self.owner, self.prop_path)[self.array_index]
+
+    def is_alive(self) -> bool:
+        try:
+            owner = self.id.path_resolve(self.rna_path) if self.rna_path else self.id
+            return owner.as_pointer() == self.owner.as_pointer()
+        except Exception as _:
+            return False
+
+    def number(self) -> Any:
+        value = self.get()
+        if self.prop.type != 'ENUM':
+            return value
+        items = self.prop.enum_items
+        if self.prop.is_enum_flag:
+            return sum(items[v].value for v in value)
+        return items[value].value if value in items else 0
+
+    def set(self, value: Any) -> None:
+        if self.array_index is None:
+            setattr(self.owner, self.prop_path, value)
+        else:
+            getattr(self.owner, self.prop_path)[self.array_index] = value
+
+    def cast(self, value: Any) -> Any:
+        if self.is_vector:
+            return [self.cast_item(v) for v in value]
+        return self.cast_item(value)
+
+    def cast_item(self, value: Any) -> Any:
+        if self.prop.type == 'INT':
+            return int(value)
+        if self.prop.type == 'BOOLEAN':
+            return bool(value)
+        if self.prop.type == 'ENUM':
+            value = int(value)
+            if self.prop.is_enum_flag:
+                return {i.identifier for i in self.prop.enum_items if i.value & value}
+            for i in self.prop.enum_items:
+                if i.value == value:
+                    return i.identifier
+            return self.get()
+        return value
+# endregion
+
+# region caches
+class LRUCache:
+    def __init__(self, maxsize: int, weigher: Union[Callable[[Any], int], None] = None) -> None:
+        self.maxsize = maxsize
+        self.weigher = weigher
+        self.data: OrderedDict = OrderedDict()
+        self.weights: dict[Any, int] = dict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            res = self.data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return res
+
+    def peek(self, key: Any, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def put(self, key: Any, value: Any) -> None:
+        self.discard(key)
+        weight = 1 if self.weigher is None else self.weigher(value)
+        if weight > self.maxsize:
+            return
+        self.data[key] = value
+        self.weights[key] = weight
+        self.size += weight
+        while self.size > self.maxsize:
+            self.discard(next(iter(self.data)))
+
+    def discard(self, key: Any) -> None:
+        if not key in self.weights:
+            return
+        del self.data[key]
+        self.size -= self.weights.pop(key)
+
+    def discard_if(self, predicate: Callable[[Any], bool]) -> None:
+        for key in [k for k in self.data if predicate(k)]:
+            self.discard(key)
+
+    def clear(self) -> None:
+        self.data.clear()
+        self.weights.clear()
+        self.size = 0
+
+    def info(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': self.size, 'maxsize': self.maxsize}
+
+_UTILS_DISASSEMBLY_CACHE: LRUCache = LRUCache(_PROPTRACE_DISASSEMBLY_CACHE_SIZE)
+_UTILS_RECOGNITION_CACHE: LRUCache = LRUCache(_PROPTRACE_RECOGNITION_CACHE_SIZE)
+_UTILS_EXPANSION_CACHE: LRUCache = LRUCache(_PROPTRACE_EXPANSION_CACHE_SIZE)
+_UTILS_ACCESSOR_CACHE: dict[tuple[int, int, str], Accessor] = dict()
+_UTILS_ENUM_ITEMS: dict[tuple[int, str, str], list[tuple[str, str, str, str, int]]] = dict()
 # endregion
 
 # region functions
+def id_key(id: bpy.types.ID) -> tuple[int, int]:
+    return id.as_pointer(), getattr(id, 'session_uid', 0)
+
 def path_disassembly(path: str) -> list[DisassemblyItem]:
+    res = _UTILS_DISASSEMBLY_CACHE.get(path)
+    if res is None:
+        res = tuple(path_disassembly_uncached(path))
+        _UTILS_DISASSEMBLY_CACHE.put(path, res)
+    return list(res)
+
+def path_disassembly_uncached(path: str) -> list[DisassemblyItem]:
     res = _PROPTRACE_RE_PATH_DISASSEMBLY.finditer(path)
     result = []
     for r in res:
@@ -45,7 +192,63 @@ def path_disassembly(path: str) -> list[DisassemblyItem]:
             result.append(DisassemblyItem('str', r.group('str')))
     return result
 
-def path_assembly(id: bpy.types.ID, path: list[DisassemblyItem], resolve=True) -> list[AssemblyItem]:
+def path_step(data: Any, item: DisassemblyItem) -> Any:
+    if item.type == 'path':
+        return getattr(data, item.path)
+    if item.type == 'int':
+        return data[item.path]
+    if item.type == 'str':
+        return data[_PROPTRACE_RE_PATH_UNESCAPE.sub(r'\1', item.path[1:-1])]
+    raise KeyError(item.path)
+
+def path_quote(key: str) -> str:
+    return '"'+key.replace('\\', '\\\\').replace('"', '\\"')+'"'
+
+def is_wildcard(item: DisassemblyItem) -> bool:
+    return item.type == 'str' and any(c in item.path for c in _PROPTRACE_WILDCARD_CHARS)
+
+def path_expand(id: bpy.types.ID, path: str) -> list[str]:
+    if not isinstance(id, bpy.types.ID) or path == '':
+        return []
+    pd = path_disassembly(path)
+    if not any(is_wildcard(item) for item in pd):
+        return [path]
+
+    key = (*id_key(id), path)
+    res = _UTILS_EXPANSION_CACHE.get(key)
+    if res is None:
+        res = tuple(path_expand_uncached(id, pd))
+        _UTILS_EXPANSION_CACHE.put(key, res)
+    return list(res)
+
+def path_expand_uncached(id: bpy.types.ID, path: list[DisassemblyItem]) -> list[str]:
+    res: list[tuple[Any, str]] = [(id, '')]
+    for i, p in enumerate(path):
+        expanded = []
+        for data, stmp in res:
+            if is_wildcard(p):
+                pattern = _PROPTRACE_RE_PATH_UNESCAPE.sub(r'\1', p.path[1:-1])
+                try:
+                    keys = data.keys()
+                except Exception as _:
+                    continue
+                for k in keys:
+                    if fnmatch.fnmatchcase(k, pattern):
+                        expanded.append((data[k], stmp+'['+path_quote(k)+']'))
+                continue
+            try:
+                tmp = path_step(data, p)
+            except Exception as _:
+                continue
+            if p.type == 'path':
+                e = ('' if i == 0 else '.')+p.path
+            else:
+                e = '['+str(p.path)+']'
+            expanded.append((tmp, stmp+e))
+        res = expanded
+    return [stmp for data, stmp in res]
+
+def path_assembly(id: bpy.types.ID, path: list[DisassemblyItem], resolve=True, incremental=True) -> list[AssemblyItem]:
     res = [AssemblyItem(None, '', id, None, 'id')]
     tmp = id
     stmp = ''
@@ -61,7 +264,13 @@ def path_assembly(id: bpy.types.ID, path: list[DisassemblyItem], resolve=True) -
                 prop = tmp.bl_rna.properties[p.path]
             except Exception as _:
                 prop = None
-            tmp = id.path_resolve(stmp)
+            if incremental:
+                try:
+                    tmp = path_step(tmp, p)
+                except Exception as _:
+                    tmp = id.path_resolve(stmp)
+            else:
+                tmp = id.path_resolve(stmp)
         res.append(AssemblyItem(prop, stmp, tmp, p.path, p.type))
     return res
 
@@ -69,6 +278,18 @@ def path_recognize(id: bpy.types.ID, path: str) -> Union[Interpretation, None]:
     if not isinstance(id, bpy.types.ID) or path == '':
         return
 
+    key = (*id_key(id), path)
+    res = _UTILS_RECOGNITION_CACHE.get(key)
+    if res is None:
+        res = path_recognize_uncached(id, path)
+        if not res is None:
+            _UTILS_RECOGNITION_CACHE.put(key, res)
+    return res
+
+def path_recognize_uncached(id: bpy.types.ID, path: str) -> Union[Interpretation, None]:
+    if not isinstance(id, bpy.types.ID) or path == '':
+        return
+
     try:
         id.path_resolve(path)
         pd = path_disassembly(path)
@@ -99,7 +320,7 @@ def path_recognize(id: bpy.types.ID, path: str) -> Union[Interpretation, None]:
             item.prop
         )
 
-def animatable(id: bpy.types.ID, path: str) -> Union[Interpretation, None]:
+def animatable(id: bpy.types.ID, path: str, allow_array: bool = False) -> Union[Interpretation, None]:
     pr = path_recognize(id, path)
     if pr is None:
         return
@@ -112,9 +333,131 @@ def animatable(id: bpy.types.ID, path: str) -> Union[Interpretation, None]:
         return
     if pr.prop.type in ('BOOLEAN', 'INT', 'FLOAT'):
         if pr.prop.is_array and pr.array_index is None:
-            return
+            if not allow_array:
+                return
+            if pr.prop.array_dimensions[1] != 0 or pr.prop.array_length > _PROPTRACE_ARRAY_MAX_LENGTH:
+                return
     return pr
 
+def accessor(id: bpy.types.ID, path: str) -> Union[Accessor, None]:
+    if not isinstance(id, bpy.types.ID) or path == '':
+        return
+    key = (*id_key(id), path)
+    res = _UTILS_ACCESSOR_CACHE.get(key)
+    if not res is None:
+        if res.is_alive():
+            return res
+        del _UTILS_ACCESSOR_CACHE[key]
+        _UTILS_RECOGNITION_CACHE.discard(key)
+
+    try:
+        anim = animatable(id, path, True)
+    except Exception as _:
+        return
+    if anim is None:
+        return
+    res = Accessor(
+        anim.id,
+        anim.id.path_resolve(anim.rna_path) if anim.rna_path else anim.id,
+        anim.prop_path,
+        anim.array_index,
+        anim.prop,
+        *accessor_collection(anim.id, anim.rna_path),
+        anim.rna_path
+    )
+    _UTILS_ACCESSOR_CACHE[key] = res
+    return res
+
+def accessor_collection(id: bpy.types.ID, rna_path: str) -> tuple[Union[bpy.types.bpy_prop_collection, None], str, int]:
+    pd = path_disassembly(rna_path) if rna_path else []
+    if not pd or not pd[-1].type in ('int', 'str'):
+        return None, '', -1
+    collection_path = rna_path[:rna_path.rindex('[')]
+    try:
+        collection = id.path_resolve(collection_path)
+    except Exception as _:
+        return None, '', -1
+    if not isinstance(collection, bpy.types.bpy_prop_collection):
+        return None, '', -1
+    if pd[-1].type == 'int':
+        item_index = pd[-1].path
+    else:
+        item_index = collection.find(_PROPTRACE_RE_PATH_UNESCAPE.sub(r'\1', pd[-1].path[1:-1]))
+    if item_index < 0:
+        return None, '', -1
+    return collection, collection_path, item_index
+
+def accessors(id: bpy.types.ID, path: str) -> list[Accessor]:
+    res = []
+    for p in path_expand(id, path):
+        acc = accessor(id, p)
+        if not acc is None:
+            res.append(acc)
+    return res
+
+def accessor_invalidate(id: Union[bpy.types.ID, None] = None, path: Union[str, None] = None) -> None:
+    if id is None:
+        _UTILS_ACCESSOR_CACHE.clear()
+        _UTILS_RECOGNITION_CACHE.clear()
+        _UTILS_EXPANSION_CACHE.clear()
+        return
+    if not isinstance(id, bpy.types.ID):
+        return
+    ik = id_key(id)
+    if path is None:
+        for key in [k for k in _UTILS_ACCESSOR_CACHE if k[:2] == ik]:
+            del _UTILS_ACCESSOR_CACHE[key]
+        _UTILS_RECOGNITION_CACHE.discard_if(lambda k: k[:2] == ik)
+        _UTILS_EXPANSION_CACHE.discard_if(lambda k: k[:2] == ik)
+        return
+    paths = [path, *_UTILS_EXPANSION_CACHE.peek((*ik, path), ())]
+    _UTILS_EXPANSION_CACHE.discard((*ik, path))
+    for p in paths:
+        _UTILS_ACCESSOR_CACHE.pop((*ik, p), None)
+        _UTILS_RECOGNITION_CACHE.discard((*ik, p))
+
+def cache_invalidate(id: Union[bpy.types.ID, None] = None) -> None:
+    accessor_invalidate(id)
+
+def cache_clear() -> None:
+    _UTILS_DISASSEMBLY_CACHE.clear()
+    _UTILS_ENUM_ITEMS.clear()
+    accessor_invalidate()
+
+def cache_info() -> dict[str, dict[str, int]]:
+    return {
+        'disassembly': _UTILS_DISASSEMBLY_CACHE.info(),
+        'recognition': _UTILS_RECOGNITION_CACHE.info(),
+        'expansion': _UTILS_EXPANSION_CACHE.info(),
+        'enum_items': {'size': len(_UTILS_ENUM_ITEMS)}
+    }
+
+def is_equal(a: Any, b: Any, epsilon: float = 0.0) -> bool:
+    if isinstance(a, (tuple, list)) or isinstance(b, (tuple, list)):
+        try:
+            return len(a) == len(b) and all(is_equal(x, y, epsilon) for x, y in zip(a, b))
+        except TypeError:
+            return False
+    if isinstance(a, float) or isinstance(b, float):
+        try:
+            return abs(a-b) <= epsilon
+        except TypeError:
+            return False
+    return a == b
+
+def property_key(owner: bpy.types.bpy_struct, property: bpy.types.Property) -> tuple[int, str, str]:
+    return owner.as_pointer(), owner.bl_rna.identifier, property.identifier
+
+def enum_items(property: bpy.types.Property, owner: Union[bpy.types.bpy_struct, None] = None) -> list[tuple[str, str, str, str, int]]:
+    if owner is None:
+        return [(i.identifier, i.name, i.description, i.icon, i.value) for i in property.enum_items]
+    key = property_key(owner, property)
+    res = _UTILS_ENUM_ITEMS.get(key)
+    if res is None:
+        res = [(i.identifier, i.name, i.description, i.icon, i.value) for i in property.enum_items]
+        _UTILS_ENUM_ITEMS[key] = res
+    return res
+
 def copy_anim_property(property: bpy.types.Property, cb: Callable[[Any, bpy.types.Context], None]) -> Union[bpy.props._PropertyDeferred, None]:
     if not isinstance(property, bpy.types.Property):
         return
@@ -1,7 +1,10 @@
 
+from dataclasses import dataclass
 import enum
-from typing import Any, Callable, Literal, Union
+import time
+from typing import Any, Callable, Iterable, Literal, Union
 import bpy
+import numpy as np
 from . import utils
 from . import property_tracer
 from . import fcurve_observer
@@ -13,6 +16,17 @@ _VIRTUALDRIVER_BASE_TYPE_PARENT: bpy.types.bpy_struct = None
 _VIRTUALDRIVER_BASE_ACCESS_CONTEXT: Callable[[bpy.types.Context, bool], Union[bpy.types.bpy_struct, list[bpy.types.bpy_struct], None]] = None
 _VIRTUALDRIVER_BASE_ACCESS_ID: Callable[[bpy.types.ID, bool], Union[bpy.types.bpy_struct, list[bpy.types.bpy_struct], None]] = None
 _VIRTUALDRIVER_BASE_PATHS: dict[str, bpy.props._PropertyDeferred] = dict()
+_VIRTUALDRIVER_DIRTY_TRACKING: bool = True
+_VIRTUALDRIVER_TRANSFORM_VARIABLE_TYPES: set[str] = {'TRANSFORMS', 'LOC_DIFF', 'ROTATION_DIFF'}
+_VIRTUALDRIVER_SYNC_FINGERPRINTS: dict[tuple[int, int, str, int], tuple] = dict()
+_VIRTUALDRIVER_WRITE_EPSILON: float = 1e-6
+_VIRTUALDRIVER_VECTORIZED: bool = True
+_VIRTUALDRIVER_FOREACH_DTYPES: dict[str, type] = {'FLOAT': np.float32, 'INT': np.int32}
+_VIRTUALDRIVER_DEFERRED: bool = False
+_VIRTUALDRIVER_DEFERRED_INTERVAL: float = 1/30
+_VIRTUALDRIVER_FRAME_CACHE_ENABLED: bool = False
+_VIRTUALDRIVER_FRAME_CACHE_SIZE: int = 64*1024*1024
+_VIRTUALDRIVER_MIRROR: bool = True
 # endregion
 
 # region property classes
@@ -64,13 +78,16 @@ def virtual_driver_update(self: VirtualDriver, context: bpy.types.Context, ident
 
 def internal_virtual_driver_update(self: InternalVirtualDriver, context: bpy.types.Context, identifier: str):
     global _VIRTUALDRIVER_TRACE_MODE
-    if _VIRTUALDRIVER_TRACE_MODE is TraceMode.panel:
-        return
-
     props = get_props_intern(self)
     if props is None:
         return
     base, vd, ivd, index, block = props
+    property_tracer.trace_index_update(base, self, identifier)
+
+    if not _VIRTUALDRIVER_MIRROR:
+        return
+    if _VIRTUALDRIVER_TRACE_MODE is TraceMode.panel:
+        return
     if block is None:
         return
 
@@ -80,6 +97,8 @@ def internal_virtual_driver_update(self: InternalVirtualDriver, context: bpy.typ
 
 def virtual_driver_index_update(self: bpy.types.bpy_struct, context: bpy.types.Context):
     global _VIRTUALDRIVER_TRACE_MODE
+    if not _VIRTUALDRIVER_MIRROR:
+        return
     if _VIRTUALDRIVER_TRACE_MODE is TraceMode.panel:
         return
 
@@ -101,6 +120,12 @@ def virtual_driver_index_update(self: bpy.types.bpy_struct, context: bpy.types.C
 class VIRTUALDRIVER_OT_add(property_tracer.PROPTRACE_OT_add):
     bl_idname = 'virtual_driver.add'
 
+class VIRTUALDRIVER_OT_target_add(property_tracer.PROPTRACE_OT_target_add):
+    bl_idname = 'virtual_driver.target_add'
+
+class VIRTUALDRIVER_OT_target_remove(property_tracer.PROPTRACE_OT_target_remove):
+    bl_idname = 'virtual_driver.target_remove'
+
 class VIRTUALDRIVER_OT_remove(property_tracer.PROPTRACE_OT_remove):
     bl_idname = 'virtual_driver.remove'
 
@@ -122,6 +147,7 @@ class VIRTUALDRIVER_OT_remove(property_tracer.PROPTRACE_OT_remove):
             return {'CANCELLED'}
         vd.fcurve = False
         block.fcurve = False
+        sync_invalidate()
         return super().execute(context)
 # endregion
 
@@ -130,7 +156,7 @@ class OBJECT_UL_VirtualDriver(bpy.types.UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index) -> None:
         if self.layout_type in {'DEFAULT', 'COMPACT'}:
             row = layout.row(align=True)
-            row.prop(item, 'name', icon='ANIM', text='', emboss=False)
+            row.prop(item, 'name', icon='ERROR' if index in dependency_cycles(data) else 'ANIM', text='', emboss=False)
             row.prop(item, 'mute', icon='CHECKBOX_HLT' if not item.mute else 'CHECKBOX_DEHLT', text='', emboss=False)
         elif self.layout_type in {'GRID'}:
             layout.alignment = 'CENTER'
@@ -179,12 +205,46 @@ class OBJECT_PT_VirtualDriver(bpy.types.Panel):
         if not ivd or index < 0:
             return
 
+        cycles = dependency_cycles(base)
+        if cycles:
+            layout.label(text='Dependency cycle: '+', '.join(ivd[i].name for i in sorted(cycles) if i < len(ivd)), icon='ERROR')
+
+        data = vd if _VIRTUALDRIVER_MIRROR else block
+        if data is None:
+            return
         box = layout.box().column()
-        box.template_any_ID(vd, 'id', 'id_type', text='Prop:')
-        box.template_path_builder(vd, 'data_path', vd.id, text='Path')
+        box.template_any_ID(data, 'id', 'id_type' if _VIRTUALDRIVER_MIRROR else 'id_type_enum', text='Prop:')
+        box.template_path_builder(data, 'data_path', data.id, text='Path')
 
-        if vd.is_valid:
-            box.prop(vd, 'prop')
+        if data.is_valid:
+            if data.array_length:
+                col = box.column(align=True)
+                for i in range(data.array_length):
+                    col.prop(data, 'prop_array', index=i, text='')
+            else:
+                slot = property_tracer.prop_slot(data)
+                box.prop(data, slot)
+                if slot != 'prop':
+                    box.prop(data, 'prop', text='Driver')
+                limits = property_tracer.source_range(data)
+                if not limits is None:
+                    box.label(text='Range: {:g} to {:g}'.format(*limits))
+
+        if block is None:
+            return
+        box = layout.box().column()
+        row = box.row()
+        row.label(text='Targets:')
+        row.operator(VIRTUALDRIVER_OT_target_add.bl_idname, icon='ADD', text='')
+        for i, target in enumerate(block.targets):
+            col = box.column(align=True)
+            row = col.row(align=True)
+            row.template_any_ID(target, 'id', 'id_type', text='')
+            op = row.operator(VIRTUALDRIVER_OT_target_remove.bl_idname, icon='X', text='')
+            op.index = i
+            row = col.row(align=True)
+            row.alert = bool(target.data_path) and not target.is_valid
+            row.template_path_builder(target, 'data_path', target.id, text='Path')
 # endregion
 
 # region property accesses
@@ -221,10 +281,10 @@ def get_props_intern(
         if isinstance(data, bpy.types.ID):
             base = data
         else:
-            ip = utils.path_recognize(data.id_data, data.path_from_id())
-            if ip is None:
+            owner = property_tracer.owner_resolve(data)
+            if owner is None:
                 return
-            base = ip.id.path_resolve(ip.rna_path) if ip.rna_path else ip.id
+            base = owner[0]
         return get_props_sub(base)
     except Exception as _:
         return
@@ -260,38 +320,377 @@ def get_props_extern(
         return [get_props_sub(b) for b in base]
 # endregion
 
+# region dirty tracking
+@dataclass
+class DepsgraphUpdates:
+    ids: set[int]
+    transform: set[int]
+    geometry: set[int]
+
+def depsgraph_updates(depsgraph: bpy.types.Depsgraph) -> DepsgraphUpdates:
+    res = DepsgraphUpdates(set(), set(), set())
+    for update in depsgraph.updates:
+        id: Union[bpy.types.ID, None] = update.id
+        if id is None:
+            continue
+        ptr = id.original.as_pointer()
+        res.ids.add(ptr)
+        if update.is_updated_transform:
+            res.transform.add(ptr)
+        if update.is_updated_geometry:
+            res.geometry.add(ptr)
+    return res
+
+def is_source_dirty(ptr: int, variable_type: str, updates: DepsgraphUpdates) -> bool:
+    if variable_type in _VIRTUALDRIVER_TRANSFORM_VARIABLE_TYPES:
+        return ptr in updates.transform or ptr in updates.geometry
+    return ptr in updates.ids
+# endregion
+
+# region echo suppression
+_VIRTUALDRIVER_ECHO: dict[int, dict[tuple[int, int, int, str, Union[int, None]], tuple[utils.Accessor, Any]]] = dict()
+
+def echo_record(id: bpy.types.ID, acc: Union[utils.Accessor, None] = None, value: Any = None) -> None:
+    writes = _VIRTUALDRIVER_ECHO.setdefault(id.as_pointer(), dict())
+    if not acc is None:
+        writes[write_key(acc)] = (acc, value)
+
+def is_echo(updates: DepsgraphUpdates) -> bool:
+    if not updates.ids or not _VIRTUALDRIVER_ECHO:
+        return False
+    if property_tracer.trace_index_has_pending():
+        return False
+    if not all(ptr in _VIRTUALDRIVER_ECHO for ptr in updates.ids):
+        return False
+    try:
+        for ptr in updates.ids:
+            for acc, value in _VIRTUALDRIVER_ECHO[ptr].values():
+                if not acc.is_alive() or not utils.is_equal(acc.get(), value, _VIRTUALDRIVER_WRITE_EPSILON):
+                    return False
+    except Exception as _:
+        return False
+    return True
+
+def echo_invalidate() -> None:
+    _VIRTUALDRIVER_ECHO.clear()
+# endregion
+
+# region source index
+@dataclass
+class SourceIndex:
+    sources: dict[int, list[tuple[int, str]]]
+    unindexed: set[int]
+    signatures: list[Union[tuple, None]]
+    mirror: Union[tuple, None] = None
+    revision: int = -1
+
+_VIRTUALDRIVER_SOURCE_INDEX: dict[int, SourceIndex] = dict()
+
+def driver_signature(fcurves: list[bpy.types.FCurve]) -> Union[tuple, None]:
+    if not fcurves:
+        return None
+    return (
+        tuple((f.driver.type, f.driver.expression) for f in fcurves),
+        tuple((id.as_pointer(), data_path, variable_type) for f in fcurves for id, data_path, variable_type in fcurve_observer.sources(f))
+    )
+
+def entry_signature(base: bpy.types.bpy_struct, b: InternalVirtualDriver) -> Union[tuple, None]:
+    states = fcurve_observer.query_many(base.id_data, b.fcurve_keys())
+    return driver_signature([fcurves[0] for state, fcurves in states.values() if fcurves])
+
+def mirror_fingerprint(vd: VirtualDriver) -> tuple:
+    states = fcurve_observer.query_many(vd.id_data, vd.fcurve_keys())
+    return tuple(fcurve_observer.fingerprint(fcurves[0]) for state, fcurves in states.values() if fcurves)
+
+def source_index_build(
+    base: bpy.types.bpy_struct,
+    ivd: list[InternalVirtualDriver],
+    previous: Union[SourceIndex, None],
+    signatures: Union[list[Union[tuple, None]], None] = None
+) -> SourceIndex:
+    if signatures is None:
+        signatures = [entry_signature(base, b) for b in ivd]
+    res = SourceIndex(dict(), set(), signatures, None if previous is None else previous.mirror)
+    for i, signature in enumerate(signatures):
+        if not previous is None and (i >= len(previous.signatures) or previous.signatures[i] != signature):
+            property_tracer.trace_index_touch(base, i)
+        if signature is None:
+            continue
+        if not signature[1]:
+            res.unindexed.add(i)
+            continue
+        for ptr, data_path, variable_type in signature[1]:
+            res.sources.setdefault(ptr, []).append((i, variable_type))
+    return res
+
+def source_index_get(base: bpy.types.bpy_struct, ivd: list[InternalVirtualDriver], refresh: bool) -> SourceIndex:
+    key = base.as_pointer()
+    sindex = _VIRTUALDRIVER_SOURCE_INDEX.get(key)
+    if sindex is None or len(sindex.signatures) != len(ivd):
+        sindex = source_index_build(base, ivd, sindex)
+        _VIRTUALDRIVER_SOURCE_INDEX[key] = sindex
+    elif refresh:
+        signatures = [entry_signature(base, b) for b in ivd]
+        if signatures != sindex.signatures:
+            sindex = source_index_build(base, ivd, sindex, signatures)
+            _VIRTUALDRIVER_SOURCE_INDEX[key] = sindex
+    return sindex
+
+def source_index_invalidate(base: Union[bpy.types.bpy_struct, None] = None) -> None:
+    if base is None:
+        _VIRTUALDRIVER_SOURCE_INDEX.clear()
+        return
+    _VIRTUALDRIVER_SOURCE_INDEX.pop(base.as_pointer(), None)
+
+def affected_entries(
+    base: Union[bpy.types.bpy_struct, None],
+    vd: Union[VirtualDriver, None],
+    ivd: Union[list[InternalVirtualDriver], None],
+    index: Union[int, None],
+    block: Union[InternalVirtualDriver, None],
+    updates: DepsgraphUpdates
+) -> set[int]:
+    if base is None or not ivd:
+        return set()
+
+    ptr = base.id_data.as_pointer()
+    updated = ptr in updates.ids
+    previous = _VIRTUALDRIVER_SOURCE_INDEX.get(base.as_pointer())
+    revision = fcurve_observer.revision(base.id_data) if updated else -1
+    sindex = source_index_get(base, ivd, updated and (previous is None or previous.revision != revision))
+    if updated:
+        sindex.revision = revision
+    res = set(sindex.unindexed)
+    stale = not sindex is previous or bool(property_tracer.trace_index_touched(base))
+    stale |= bool(sindex.unindexed) and any(p != ptr for p in updates.ids)
+    if updated and _VIRTUALDRIVER_MIRROR and not vd is None and not block is None:
+        mirror = mirror_fingerprint(vd)
+        if mirror != sindex.mirror:
+            sindex.mirror = mirror
+            res.add(index)
+            stale = True
+    for p in updates.ids:
+        for i, variable_type in sindex.sources.get(p, ()):
+            if is_source_dirty(p, variable_type, updates):
+                res.add(i)
+                stale = True
+    if stale:
+        frame_cache_invalidate(base)
+    for i in property_tracer.trace_index_query(base, ivd, updates.ids):
+        property_tracer.trace_index_touch(base, i)
+    res |= property_tracer.trace_index_touched(base)
+    return {i for i in res if i < len(ivd)}
+# endregion
+
+# region dependency graph
+@dataclass
+class DependencyGraph:
+    trace: property_tracer.TraceIndex
+    source: SourceIndex
+    dependents: dict[int, set[int]]
+    levels: list[int]
+    depth: int
+    cycles: set[int]
+
+_VIRTUALDRIVER_DEPENDENCY_GRAPHS: dict[int, DependencyGraph] = dict()
+
+def dependency_reads(
+    base: bpy.types.bpy_struct,
+    b: InternalVirtualDriver
+) -> list[tuple[int, Union[tuple[int, str, Union[int, None]], None]]]:
+    states = fcurve_observer.query_many(base.id_data, b.fcurve_keys())
+    res = []
+    for state, fcurves in states.values():
+        if not fcurves:
+            continue
+        for id, data_path, variable_type in fcurve_observer.sources(fcurves[0]):
+            if variable_type in _VIRTUALDRIVER_TRANSFORM_VARIABLE_TYPES or data_path == '':
+                res.append((id.as_pointer(), None))
+                continue
+            acc = utils.accessor(id, data_path)
+            res.append((id.as_pointer(), None if acc is None else (acc.owner.as_pointer(), acc.prop_path, acc.array_index)))
+    return res
+
+def dependency_graph_build(
+    base: bpy.types.bpy_struct,
+    ivd: list[InternalVirtualDriver],
+    tindex: property_tracer.TraceIndex,
+    sindex: SourceIndex
+) -> DependencyGraph:
+    ids: dict[int, set[int]] = dict()
+    writers: dict[tuple[int, str], list[tuple[int, Union[int, None]]]] = dict()
+    for i, b in enumerate(ivd):
+        if not b.is_valid:
+            continue
+        for acc in property_tracer.bindings(b):
+            ids.setdefault(acc.id.as_pointer(), set()).add(i)
+            writers.setdefault((acc.owner.as_pointer(), acc.prop_path), []).append((i, acc.array_index))
+
+    dependents: dict[int, set[int]] = dict()
+    for j, signature in enumerate(sindex.signatures):
+        if signature is None or not signature[1]:
+            continue
+        for ptr, read in dependency_reads(base, ivd[j]):
+            if read is None:
+                writes = ids.get(ptr, ())
+            else:
+                owner, prop_path, array_index = read
+                writes = [i for i, index in writers.get((owner, prop_path), ()) if index is None or array_index is None or index == array_index]
+            for i in writes:
+                dependents.setdefault(i, set()).add(j)
+
+    count = len(ivd)
+    indegree = [0]*count
+    for js in dependents.values():
+        for j in js:
+            indegree[j] += 1
+    levels = [0]*count
+    queue = [i for i in range(count) if indegree[i] == 0]
+    for i in queue:
+        for j in sorted(dependents.get(i, ())):
+            levels[j] = max(levels[j], levels[i]+1)
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                queue.append(j)
+
+    remaining = {i for i in range(count) if indegree[i] > 0}
+    cycles = {i for i in remaining if dependency_reaches(dependents, remaining, i, i)}
+    depth = max(levels, default=0)+1
+    for i in remaining:
+        levels[i] = depth
+    if remaining:
+        depth += 1
+    return DependencyGraph(tindex, sindex, dependents, levels, depth, cycles)
+
+def dependency_reaches(dependents: dict[int, set[int]], nodes: set[int], start: int, goal: int) -> bool:
+    visited = set()
+    stack = [start]
+    while stack:
+        for j in dependents.get(stack.pop(), ()):
+            if j == goal:
+                return True
+            if j in nodes and not j in visited:
+                visited.add(j)
+                stack.append(j)
+    return False
+
+def dependency_graph_get(base: bpy.types.bpy_struct, ivd: list[InternalVirtualDriver], refresh: bool) -> DependencyGraph:
+    key = base.as_pointer()
+    tindex = property_tracer.trace_index_get(base, ivd)
+    sindex = source_index_get(base, ivd, refresh)
+    dgraph = _VIRTUALDRIVER_DEPENDENCY_GRAPHS.get(key)
+    if dgraph is None or not dgraph.trace is tindex or not dgraph.source is sindex:
+        dgraph = dependency_graph_build(base, ivd, tindex, sindex)
+        _VIRTUALDRIVER_DEPENDENCY_GRAPHS[key] = dgraph
+    return dgraph
+
+def dependency_levels(dgraph: DependencyGraph, entries: Iterable[int], count: int) -> list[set[int]]:
+    todo = {i for i in entries if i < count}
+    stack = list(todo)
+    while stack:
+        for j in dgraph.dependents.get(stack.pop(), ()):
+            if not j in todo:
+                todo.add(j)
+                stack.append(j)
+    res: list[set[int]] = [set() for _ in range(dgraph.depth)]
+    for i in todo:
+        res[dgraph.levels[i]].add(i)
+    return [level for level in res if level]
+
+def dependency_cycles(base: bpy.types.bpy_struct) -> set[int]:
+    dgraph = _VIRTUALDRIVER_DEPENDENCY_GRAPHS.get(base.as_pointer())
+    return set() if dgraph is None else dgraph.cycles
+
+def dependency_invalidate(base: Union[bpy.types.bpy_struct, None] = None) -> None:
+    if base is None:
+        _VIRTUALDRIVER_DEPENDENCY_GRAPHS.clear()
+        return
+    _VIRTUALDRIVER_DEPENDENCY_GRAPHS.pop(base.as_pointer(), None)
+# endregion
+
 # region property iterators
+def entries_iter(
+    ivd: list[InternalVirtualDriver],
+    entries: Union[Iterable[int], None]
+) -> Iterable[InternalVirtualDriver]:
+    if entries is None:
+        return ivd
+    return (ivd[i] for i in sorted(entries))
+
 def update_fcurve_iter(
     base: Union[bpy.types.bpy_struct, None],
     vd: Union[VirtualDriver, None],
     ivd: Union[list[InternalVirtualDriver], None],
     index: Union[int, None],
-    block: Union[InternalVirtualDriver, None]
+    block: Union[InternalVirtualDriver, None],
+    entries: Union[Iterable[int], None] = None
 ) -> None:
+    blocks: list[Union[VirtualDriver, InternalVirtualDriver]] = []
     if not ivd is None:
-        for b in ivd:
-            if b.is_valid:
-                b.fcurve = True
-    if not vd is None:
+        blocks.extend(b for b in entries_iter(ivd, entries) if b.is_valid)
+    if not vd is None and _VIRTUALDRIVER_MIRROR:
         if vd.is_valid:
-            vd.fcurve = True
+            blocks.append(vd)
+    if not blocks:
+        return
+
+    keys = [b.fcurve_keys() for b in blocks]
+    states = fcurve_observer.query_many(blocks[0].id_data, [key for k in keys for key in k])
+    for b, k in zip(blocks, keys):
+        has = any(states[key][1] for key in k)
+        if b.fcurve != has:
+            b.fcurve = has
+            echo_record(b.id_data)
 
 def sync_fcurve(pfrom: Union[VirtualDriver, InternalVirtualDriver], pto: Union[VirtualDriver, InternalVirtualDriver]) -> None:
     if not pfrom.fcurve and not pto.fcurve:
         return
-    fcurve_observer.delete(pto.id_data, pto.path_from_id('prop'), 0)
-    fcurves = fcurve_observer.get(pfrom.id_data, pfrom.path_from_id('prop'), 0)
-    if fcurves is None:
+    fkeys = pfrom.fcurve_keys()
+    tkeys = pto.fcurve_keys()
+    synced = [sync_fcurve_channel(pfrom.id_data, fkey, pto.id_data, tkey) for fkey, tkey in zip(fkeys, tkeys)]
+    if len(tkeys) > len(fkeys):
+        fcurve_observer.delete_many(pto.id_data, tkeys[len(fkeys):])
+    if not any(synced):
         pfrom.fcurve = False
         pto.fcurve = False
         return
-    if isinstance(fcurves, list):
+    if not pto.fcurve:
+        pto.fcurve = True
+
+def sync_fcurve_channel(
+    fid: bpy.types.ID,
+    fkey: tuple[str, int],
+    tid: bpy.types.ID,
+    tkey: tuple[str, int]
+) -> bool:
+    key = (*utils.id_key(tid), *tkey)
+    state, fcurves = fcurve_observer.query(fid, *fkey)
+    if not fcurves:
+        fcurve_observer.delete(tid, *tkey)
+        _VIRTUALDRIVER_SYNC_FINGERPRINTS.pop(key, None)
+        return False
+    if len(fcurves) > 1:
         raise Exception('fcurve duplicated')
-    anim_data: bpy.types.AnimData = getattr(pto.id_data, 'animation_data')
-    anim_data_drivers: bpy.types.AnimDataDrivers = anim_data.drivers
-    fcopy = anim_data_drivers.from_existing(src_driver=fcurves)
-    fcopy.data_path = pto.path_from_id('prop')
-    pto.fcurve = True
+
+    fingerprint = fcurve_observer.fingerprint(fcurves[0])
+    state, targets = fcurve_observer.query(tid, *tkey)
+    target = targets[0] if len(targets) == 1 else None
+    if not target is None and _VIRTUALDRIVER_SYNC_FINGERPRINTS.get(key) == fingerprint:
+        return True
+
+    if target is None or not fcurve_observer.patch(fcurves[0], target):
+        fcurve_observer.delete(tid, *tkey)
+        anim_data: bpy.types.AnimData = getattr(tid, 'animation_data')
+        anim_data_drivers: bpy.types.AnimDataDrivers = anim_data.drivers
+        fcopy = anim_data_drivers.from_existing(src_driver=fcurves[0])
+        fcopy.data_path, fcopy.array_index = tkey
+    fcurve_observer.invalidate(tid)
+    echo_record(tid)
+    _VIRTUALDRIVER_SYNC_FINGERPRINTS[key] = fingerprint
+    return True
+
+def sync_invalidate() -> None:
+    _VIRTUALDRIVER_SYNC_FINGERPRINTS.clear()
 
 def sync_fcurve_iter(
     base: Union[bpy.types.bpy_struct, None],
@@ -300,6 +699,8 @@ def sync_fcurve_iter(
     index: Union[int, None],
     block: Union[InternalVirtualDriver, None]
 ) -> None:
+    if not _VIRTUALDRIVER_MIRROR:
+        return
     if not vd is None and not block is None:
         if vd.is_valid and block.is_valid:
             sync_fcurve(vd, block)
@@ -310,19 +711,288 @@ def back_tracer(obj: bpy.types.bpy_struct, name: str, value: Any, array_index: U
     else:
         getattr(obj, name)[array_index] = value
 
+def write_key(acc: utils.Accessor) -> tuple[int, int, int, str, Union[int, None]]:
+    return (*utils.id_key(acc.id), acc.owner.as_pointer(), acc.prop_path, acc.array_index)
+
+def back_tracer_write(acc: utils.Accessor, value: Any) -> bool:
+    value = acc.cast(value)
+    if utils.is_equal(acc.get(), value, _VIRTUALDRIVER_WRITE_EPSILON):
+        return False
+    back_tracer(acc.owner, acc.prop_path, value, acc.array_index)
+    back_tracer_record(acc, value)
+    return True
+
+def back_tracer_record(acc: utils.Accessor, value: Any) -> None:
+    echo_record(acc.id, acc, value)
+
+def back_tracer_write_owner(writes: list[tuple[utils.Accessor, Any]]) -> None:
+    acc = writes[0][0]
+    if len(writes) == 1 or acc.array_index is None:
+        for acc, value in writes:
+            back_tracer_write(acc, value)
+        return
+
+    current = getattr(acc.owner, acc.prop_path)
+    vector = list(current)
+    written = []
+    for acc, value in writes:
+        if not utils.is_equal(vector[acc.array_index], value, _VIRTUALDRIVER_WRITE_EPSILON):
+            vector[acc.array_index] = value
+            written.append((acc, value))
+    if not written:
+        return
+    setattr(acc.owner, acc.prop_path, vector)
+    for acc, value in written:
+        back_tracer_record(acc, value)
+
+def back_tracer_write_collection(groups: list[list[tuple[utils.Accessor, Any]]]) -> None:
+    acc = groups[0][0][0]
+    collection = acc.collection
+    try:
+        length = max(getattr(acc.prop, 'array_length', 0), 1)
+        values = np.empty(len(collection)*length, dtype=_VIRTUALDRIVER_FOREACH_DTYPES[acc.prop.type])
+        collection.foreach_get(acc.prop_path, values)
+    except Exception as _:
+        for writes in groups:
+            back_tracer_write_owner(writes)
+        return
+
+    previous = values.copy()
+    written = []
+    for writes in groups:
+        for acc, value in writes:
+            values[acc.item_index*length+(acc.array_index or 0)] = value
+            written.append((acc, value))
+    changed = np.abs(values-previous) > _VIRTUALDRIVER_WRITE_EPSILON if acc.prop.type == 'FLOAT' else values != previous
+    if not changed.any():
+        return
+    collection.foreach_set(acc.prop_path, values)
+    acc.id.update_tag()
+    for acc, value in written:
+        if changed[acc.item_index*length+(acc.array_index or 0)]:
+            back_tracer_record(acc, value)
+
+def is_batchable(acc: utils.Accessor) -> bool:
+    if acc.collection is None or acc.is_vector or not acc.prop.type in _VIRTUALDRIVER_FOREACH_DTYPES:
+        return False
+    if getattr(acc.prop, 'array_dimensions', (0, 0, 0))[1] != 0:
+        return False
+    try:
+        return acc.collection[acc.item_index].as_pointer() == acc.owner.as_pointer()
+    except Exception as _:
+        return False
+
+def back_tracer_flush(writes: list[tuple[utils.Accessor, Any]]) -> None:
+    owners: dict[tuple[int, str, bool], list[tuple[utils.Accessor, Any]]] = dict()
+    for acc, value in writes:
+        owners.setdefault((acc.owner.as_pointer(), acc.prop_path, acc.array_index is None), []).append((acc, acc.cast(value)))
+
+    collections: dict[tuple[int, int, str, str], list[list[tuple[utils.Accessor, Any]]]] = dict()
+    for group in owners.values():
+        acc = group[0][0]
+        if is_batchable(acc):
+            collections.setdefault((*utils.id_key(acc.id), acc.collection_path, acc.prop_path), []).append(group)
+        else:
+            back_tracer_write_owner(group)
+
+    for groups in collections.values():
+        if len(groups) == 1:
+            back_tracer_write_owner(groups[0])
+        else:
+            back_tracer_write_collection(groups)
+
+@dataclass
+class Snapshot:
+    values: np.ndarray
+    lengths: np.ndarray
+    vectors: Union[np.ndarray, None]
+    mutes: np.ndarray
+
+_VIRTUALDRIVER_SNAPSHOTS: dict[int, Snapshot] = dict()
+
+def snapshot_gather(ivd: list[InternalVirtualDriver]) -> Snapshot:
+    values = np.empty(len(ivd), dtype=np.float32)
+    ivd.foreach_get('prop', values)
+    lengths = np.empty(len(ivd), dtype=np.int32)
+    ivd.foreach_get('array_length', lengths)
+    mutes = np.empty(len(ivd), dtype=bool)
+    ivd.foreach_get('mute', mutes)
+    vectors = None
+    if lengths.any():
+        size = len(ivd[0].prop_array)
+        vectors = np.empty(len(ivd)*size, dtype=np.float32)
+        ivd.foreach_get('prop_array', vectors)
+        vectors = vectors.reshape(len(ivd), size)
+    return Snapshot(values, lengths, vectors, mutes)
+
+def snapshot_diff(base: bpy.types.bpy_struct, ivd: list[InternalVirtualDriver]) -> tuple[Snapshot, set[int]]:
+    key = base.as_pointer()
+    current = snapshot_gather(ivd)
+    previous = _VIRTUALDRIVER_SNAPSHOTS.get(key)
+    _VIRTUALDRIVER_SNAPSHOTS[key] = current
+    if previous is None or previous.values.shape != current.values.shape:
+        return current, set(range(len(current.values)))
+    changed = (current.values != previous.values) | (current.lengths != previous.lengths)
+    if not current.vectors is None:
+        if previous.vectors is None:
+            changed |= current.lengths > 0
+        else:
+            changed |= (current.vectors != previous.vectors).any(axis=1)
+    return current, set(np.flatnonzero(changed).tolist())
+
+def snapshot_value(snapshot: Snapshot, index: int, b: InternalVirtualDriver, acc: utils.Accessor) -> Any:
+    if acc.is_vector:
+        if snapshot.vectors is None:
+            return entry_value(b, acc)
+        return snapshot.vectors[index, :acc.length].tolist()
+    return float(snapshot.values[index])
+
+def entry_value(b: InternalVirtualDriver, acc: utils.Accessor) -> Any:
+    if acc.is_vector:
+        return list(b.prop_array[:acc.length])
+    return b.prop
+
+def snapshot_invalidate() -> None:
+    _VIRTUALDRIVER_SNAPSHOTS.clear()
+
+def snapshot_nbytes(snapshot: Snapshot) -> int:
+    return snapshot.values.nbytes+snapshot.lengths.nbytes+snapshot.mutes.nbytes+(0 if snapshot.vectors is None else snapshot.vectors.nbytes)
+
+_VIRTUALDRIVER_FRAME_CACHE: utils.LRUCache = utils.LRUCache(_VIRTUALDRIVER_FRAME_CACHE_SIZE, snapshot_nbytes)
+
+def frame_cache_invalidate(base: Union[bpy.types.bpy_struct, None] = None) -> None:
+    if base is None:
+        _VIRTUALDRIVER_FRAME_CACHE.clear()
+        return
+    ptr = base.as_pointer()
+    _VIRTUALDRIVER_FRAME_CACHE.discard_if(lambda k: k[0] == ptr)
+
 def back_tracer_iter(
     base: Union[bpy.types.bpy_struct, None],
     vd: Union[VirtualDriver, None],
     ivd: Union[list[InternalVirtualDriver], None],
     index: Union[int, None],
-    block: Union[InternalVirtualDriver, None]
+    block: Union[InternalVirtualDriver, None],
+    entries: Union[Iterable[int], None] = None
 ) -> None:
-    if not ivd is None:
-        for b in ivd:
-            anim = utils.animatable(b.id, b.data_path)
-            if anim is None or b.mute:
+    if ivd is None:
+        return
+    if entries is None:
+        back_tracer_all(base, ivd, range(len(ivd)))
+        return
+    snapshot: Union[Snapshot, None] = None
+    entries = set(entries)
+    if _VIRTUALDRIVER_VECTORIZED and not base is None:
+        snapshot, changed = snapshot_diff(base, ivd)
+        entries &= changed
+    if not base is None:
+        entries |= property_tracer.trace_index_pending(base)
+
+    back_tracer_flush(back_tracer_writes(base, ivd, entries, snapshot))
+
+def back_tracer_all(
+    base: Union[bpy.types.bpy_struct, None],
+    ivd: list[InternalVirtualDriver],
+    entries: Iterable[int]
+) -> None:
+    snapshot = snapshot_gather(ivd) if _VIRTUALDRIVER_VECTORIZED else None
+    if not base is None:
+        property_tracer.trace_index_settle(base)
+    back_tracer_flush(back_tracer_writes(base, ivd, entries, snapshot))
+
+def back_tracer_writes(
+    base: Union[bpy.types.bpy_struct, None],
+    ivd: list[InternalVirtualDriver],
+    entries: Iterable[int],
+    snapshot: Union[Snapshot, None]
+) -> list[tuple[utils.Accessor, Any]]:
+    writes: list[tuple[utils.Accessor, Any]] = []
+    for i in sorted(i for i in entries if i < len(ivd)):
+        b = ivd[i]
+        if snapshot is None:
+            if b.mute:
                 continue
-            back_tracer(anim.id.path_resolve(anim.rna_path) if anim.rna_path else anim.id, anim.prop_path, b.prop, anim.array_index)
+            length = b.array_length
+        else:
+            if snapshot.mutes[i]:
+                continue
+            length = int(snapshot.lengths[i])
+        accs = property_tracer.bindings(b) if base is None else property_tracer.trace_index_bindings(base, ivd, i)
+        for acc in accs:
+            if acc.length != length:
+                continue
+            writes.append((acc, entry_value(b, acc) if snapshot is None else snapshot_value(snapshot, i, b, acc)))
+    return writes
+
+def frame_iter(
+    base: Union[bpy.types.bpy_struct, None],
+    vd: Union[VirtualDriver, None],
+    ivd: Union[list[InternalVirtualDriver], None],
+    index: Union[int, None],
+    block: Union[InternalVirtualDriver, None],
+    frame: float,
+    depsgraph: bpy.types.Depsgraph
+) -> None:
+    if base is None or not ivd:
+        return
+    key = (base.as_pointer(), frame)
+    snapshot: Union[Snapshot, None] = _VIRTUALDRIVER_FRAME_CACHE.get(key) if _VIRTUALDRIVER_FRAME_CACHE_ENABLED else None
+    if not snapshot is None and len(snapshot.values) == len(ivd):
+        back_tracer_flush(back_tracer_writes(base, ivd, range(len(ivd)), snapshot))
+        depsgraph.update()
+        return
+
+    dgraph = dependency_graph_get(base, ivd, False)
+    levels = dependency_levels(dgraph, range(len(ivd)), len(ivd)) if dgraph.dependents else [range(len(ivd))]
+    for i, level in enumerate(levels):
+        if i:
+            depsgraph.update()
+        snapshot = evaluated_snapshot(base, ivd, depsgraph)
+        back_tracer_flush(back_tracer_writes(base, ivd, level, snapshot))
+    depsgraph.update()
+    if _VIRTUALDRIVER_FRAME_CACHE_ENABLED and not snapshot is None:
+        _VIRTUALDRIVER_FRAME_CACHE.put(key, snapshot)
+
+def evaluated_snapshot(
+    base: bpy.types.bpy_struct,
+    ivd: list[InternalVirtualDriver],
+    depsgraph: bpy.types.Depsgraph
+) -> Snapshot:
+    try:
+        id_eval = base.id_data.evaluated_get(depsgraph)
+        base_eval = id_eval if isinstance(base, bpy.types.ID) else id_eval.path_resolve(base.path_from_id())
+        ivd_eval: Union[list[InternalVirtualDriver], None] = getattr(base_eval, InternalVirtualDriver.identifier, None)
+    except Exception as _:
+        ivd_eval = None
+    if ivd_eval is None or len(ivd_eval) != len(ivd):
+        return snapshot_gather(ivd)
+    return snapshot_gather(ivd_eval)
+
+def chain_iter(
+    base: Union[bpy.types.bpy_struct, None],
+    vd: Union[VirtualDriver, None],
+    ivd: Union[list[InternalVirtualDriver], None],
+    index: Union[int, None],
+    block: Union[InternalVirtualDriver, None],
+    entries: Union[Iterable[int], None] = None,
+    depsgraph: Union[bpy.types.Depsgraph, None] = None
+) -> None:
+    if base is None or not ivd or depsgraph is None:
+        back_tracer_iter(base, vd, ivd, index, block, entries)
+        return
+    dgraph = dependency_graph_get(base, ivd, entries is None)
+    if not dgraph.dependents:
+        back_tracer_iter(base, vd, ivd, index, block, entries)
+        return
+
+    full = entries is None
+    for i, level in enumerate(dependency_levels(dgraph, range(len(ivd)) if full else entries, len(ivd))):
+        if i:
+            depsgraph.update()
+        if full:
+            back_tracer_all(base, ivd, level)
+        else:
+            back_tracer_iter(base, vd, ivd, index, block, level)
 
 def prop_iter(
     ids: list[bpy.types.ID],
@@ -353,7 +1023,20 @@ def prop_iter(
             ],
             None
         ]
-    ] = [lambda _: None]
+    ] = [lambda _: None],
+    prop_filter: Union[
+        Callable[
+            [
+                Union[bpy.types.bpy_struct, None],
+                Union[VirtualDriver, None],
+                Union[list[InternalVirtualDriver], None],
+                Union[int, None],
+                Union[InternalVirtualDriver, None]
+            ],
+            bool
+        ],
+        None
+    ] = None
 ) -> None:
     for base_id in ids:
         pli: Union[
@@ -375,6 +1058,8 @@ def prop_iter(
             iip(base_id)
 
         for props in pli:
+            if not prop_filter is None and not prop_filter(*props):
+                continue
             for pi in prop_iter:
                 pi(*props)
 
@@ -387,22 +1072,160 @@ _VIRTUALDRIVER_UPDATE_LOCK: bool = False
 
 @bpy.app.handlers.persistent
 def virtual_driver_depsgraph_update_post(scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph) -> None:
-    global _VIRTUALDRIVER_UPDATE_LOCK
     if _VIRTUALDRIVER_UPDATE_LOCK:
         return
 
-    _VIRTUALDRIVER_UPDATE_LOCK = True
+    updates = depsgraph_updates(depsgraph)
+    echo = is_echo(updates)
+    echo_invalidate()
+    if echo:
+        return
+    fcurve_observer.invalidate_ids(updates.ids)
+    if not _VIRTUALDRIVER_DIRTY_TRACKING:
+        frame_cache_invalidate()
+        updates = None
+
     ids: list[bpy.types.ID] = depsgraph.ids
     ids = [id.original for id in ids if isinstance(id, _VIRTUALDRIVER_BASE_TYPE_ID)]
+    if _VIRTUALDRIVER_DEFERRED:
+        deferred_mark(ids, updates)
+        return
+    virtual_driver_flush(ids, updates, depsgraph)
+
+def virtual_driver_flush(
+    ids: list[bpy.types.ID],
+    updates: Union[DepsgraphUpdates, None],
+    depsgraph: bpy.types.Depsgraph
+) -> None:
+    global _VIRTUALDRIVER_UPDATE_LOCK
+    _VIRTUALDRIVER_UPDATE_LOCK = True
+    try:
+        virtual_driver_flush_locked(ids, updates, depsgraph)
+    finally:
+        _VIRTUALDRIVER_UPDATE_LOCK = False
+
+def virtual_driver_flush_locked(
+    ids: list[bpy.types.ID],
+    updates: Union[DepsgraphUpdates, None],
+    depsgraph: bpy.types.Depsgraph
+) -> None:
+    affected: dict[int, set[int]] = dict()
+    lean = is_lean()
+
+    def prop_filter(*props) -> bool:
+        if props[0] is None:
+            return False
+        entries = affected_entries(*props, updates)
+        affected[props[0].as_pointer()] = entries
+        return bool(entries)
+
+    def entries(base: bpy.types.bpy_struct) -> Union[set[int], None]:
+        return None if updates is None else affected.get(base.as_pointer(), set())
+
     prop_iter(
         ids,
         prop_iter=[
-            update_fcurve_iter,
+            lambda *props: chain_iter(*props, entries=entries(props[0]), depsgraph=depsgraph)
+        ] if lean else [
+            lambda *props: update_fcurve_iter(*props, entries=entries(props[0])),
             sync_fcurve_iter,
-            back_tracer_iter
-        ]
+            lambda *props: chain_iter(*props, entries=entries(props[0]), depsgraph=depsgraph)
+        ],
+        prop_filter=None if updates is None else prop_filter
     )
-    _VIRTUALDRIVER_UPDATE_LOCK = False
+
+@bpy.app.handlers.persistent
+def virtual_driver_frame_change_post(scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph) -> None:
+    global _VIRTUALDRIVER_UPDATE_LOCK
+    if _VIRTUALDRIVER_UPDATE_LOCK:
+        return
+
+    _VIRTUALDRIVER_UPDATE_LOCK = True
+    try:
+        ids: list[bpy.types.ID] = depsgraph.ids
+        ids = [id.original for id in ids if isinstance(id, _VIRTUALDRIVER_BASE_TYPE_ID)]
+        prop_iter(
+            ids,
+            prop_iter=[
+                lambda *props: frame_iter(*props, frame=scene.frame_current+scene.frame_subframe, depsgraph=depsgraph)
+            ]
+        )
+    finally:
+        _VIRTUALDRIVER_UPDATE_LOCK = False
+
+def is_lean() -> bool:
+    if bpy.app.background:
+        return True
+    is_job_running: Union[Callable[[str], bool], None] = getattr(bpy.app, 'is_job_running', None)
+    return not is_job_running is None and is_job_running('RENDER')
+
+@dataclass
+class DeferredFlush:
+    ids: dict[int, bpy.types.ID]
+    updates: Union[DepsgraphUpdates, None]
+
+_VIRTUALDRIVER_DEFERRED_PENDING: Union[DeferredFlush, None] = None
+_VIRTUALDRIVER_DEFERRED_LAST: float = 0.0
+
+def deferred_mark(ids: list[bpy.types.ID], updates: Union[DepsgraphUpdates, None]) -> None:
+    global _VIRTUALDRIVER_DEFERRED_PENDING
+    pending = _VIRTUALDRIVER_DEFERRED_PENDING
+    if pending is None:
+        pending = DeferredFlush(dict(), DepsgraphUpdates(set(), set(), set()))
+        _VIRTUALDRIVER_DEFERRED_PENDING = pending
+    pending.ids.update((id.as_pointer(), id) for id in ids)
+    if updates is None or pending.updates is None:
+        pending.updates = None
+    else:
+        pending.updates.ids |= updates.ids
+        pending.updates.transform |= updates.transform
+        pending.updates.geometry |= updates.geometry
+
+    if not bpy.app.timers.is_registered(virtual_driver_deferred_flush):
+        elapsed = time.monotonic()-_VIRTUALDRIVER_DEFERRED_LAST
+        bpy.app.timers.register(virtual_driver_deferred_flush, first_interval=max(0.0, _VIRTUALDRIVER_DEFERRED_INTERVAL-elapsed))
+
+def virtual_driver_deferred_flush() -> Union[float, None]:
+    global _VIRTUALDRIVER_DEFERRED_PENDING, _VIRTUALDRIVER_DEFERRED_LAST
+    if _VIRTUALDRIVER_UPDATE_LOCK:
+        return _VIRTUALDRIVER_DEFERRED_INTERVAL
+    pending = _VIRTUALDRIVER_DEFERRED_PENDING
+    _VIRTUALDRIVER_DEFERRED_PENDING = None
+    _VIRTUALDRIVER_DEFERRED_LAST = time.monotonic()
+    if pending is None:
+        return
+    ids = []
+    for id in pending.ids.values():
+        try:
+            ids.append(id.original)
+        except ReferenceError:
+            continue
+    virtual_driver_flush(ids, pending.updates, bpy.context.evaluated_depsgraph_get())
+
+def deferred_invalidate() -> None:
+    global _VIRTUALDRIVER_DEFERRED_PENDING
+    _VIRTUALDRIVER_DEFERRED_PENDING = None
+    if bpy.app.timers.is_registered(virtual_driver_deferred_flush):
+        bpy.app.timers.unregister(virtual_driver_deferred_flush)
+
+def cache_clear() -> None:
+    utils.cache_clear()
+    property_tracer.trace_index_invalidate()
+    property_tracer.owner_invalidate()
+    source_index_invalidate()
+    dependency_invalidate()
+    sync_invalidate()
+    fcurve_observer.invalidate()
+    echo_invalidate()
+    snapshot_invalidate()
+    frame_cache_invalidate()
+    deferred_invalidate()
+
+@bpy.app.handlers.persistent
+def virtual_driver_cache_clear_post(*args) -> None:
+    cache_clear()
+
+_VIRTUALDRIVER_CACHE_CLEAR_HANDLERS: tuple[str, ...] = ('load_post', 'undo_post', 'redo_post')
 # endregion
 
 # region registration
@@ -420,6 +1243,13 @@ base_type_id = bpy.types.Scene
 base_type_parent = bpy.types.Scene
 base_access_context = virtual_driver_base_access_context
 base_access_id = virtual_driver_base_access_id
+dirty_tracking = True
+vectorized = True
+deferred = False
+deferred_interval = 1/30
+frame_cache = False
+frame_cache_size = 64*1024*1024
+mirror = True
 base_paths = {
     VirtualDriver.identifier: bpy.props.PointerProperty(type=VirtualDriver),
     InternalVirtualDriver.identifier: bpy.props.CollectionProperty(type=InternalVirtualDriver),
@@ -433,21 +1263,39 @@ def preregister(
     base_type_id: bpy.types.ID = base_type_id,
     base_type_parent: bpy.types.bpy_struct = base_type_parent,
     base_access_context: Callable[[bpy.types.Context, bool], Union[bpy.types.bpy_struct, list[bpy.types.bpy_struct], None]] = base_access_context,
-    base_access_id: Callable[[bpy.types.ID, bool], Union[bpy.types.bpy_struct, list[bpy.types.bpy_struct], None]] = base_access_id
+    base_access_id: Callable[[bpy.types.ID, bool], Union[bpy.types.bpy_struct, list[bpy.types.bpy_struct], None]] = base_access_id,
+    dirty_tracking: bool = dirty_tracking,
+    vectorized: bool = vectorized,
+    deferred: bool = deferred,
+    deferred_interval: float = deferred_interval,
+    frame_cache: bool = frame_cache,
+    frame_cache_size: int = frame_cache_size,
+    mirror: bool = mirror
 ) -> None:
-    global _VIRTUALDRIVER_BASE_TYPE_ID, _VIRTUALDRIVER_BASE_TYPE_PARENT, _VIRTUALDRIVER_BASE_ACCESS_CONTEXT, _VIRTUALDRIVER_BASE_ACCESS_ID, _VIRTUALDRIVER_BASE_PATHS
+    global _VIRTUALDRIVER_BASE_TYPE_ID, _VIRTUALDRIVER_BASE_TYPE_PARENT, _VIRTUALDRIVER_BASE_ACCESS_CONTEXT, _VIRTUALDRIVER_BASE_ACCESS_ID, _VIRTUALDRIVER_BASE_PATHS, _VIRTUALDRIVER_DIRTY_TRACKING, _VIRTUALDRIVER_VECTORIZED, _VIRTUALDRIVER_DEFERRED, _VIRTUALDRIVER_DEFERRED_INTERVAL, _VIRTUALDRIVER_FRAME_CACHE_ENABLED, _VIRTUALDRIVER_MIRROR
     _VIRTUALDRIVER_BASE_TYPE_ID = base_type_id
     _VIRTUALDRIVER_BASE_TYPE_PARENT = base_type_parent
     _VIRTUALDRIVER_BASE_ACCESS_CONTEXT = base_access_context
     _VIRTUALDRIVER_BASE_ACCESS_ID = base_access_id
     _VIRTUALDRIVER_BASE_PATHS = base_paths
-    property_tracer.preregister(base_type_parent, base_access_context)
+    _VIRTUALDRIVER_DIRTY_TRACKING = dirty_tracking
+    _VIRTUALDRIVER_VECTORIZED = vectorized
+    _VIRTUALDRIVER_DEFERRED = deferred
+    _VIRTUALDRIVER_DEFERRED_INTERVAL = deferred_interval
+    _VIRTUALDRIVER_FRAME_CACHE_ENABLED = frame_cache
+    _VIRTUALDRIVER_FRAME_CACHE.maxsize = frame_cache_size
+    frame_cache_invalidate()
+    _VIRTUALDRIVER_MIRROR = mirror
+    property_tracer.preregister(base_type_parent, base_access_context, mirror)
 
 classes = (
+    property_tracer.PropTraceTarget,
     VirtualDriver,
     InternalVirtualDriver,
     VIRTUALDRIVER_OT_add,
     VIRTUALDRIVER_OT_remove,
+    VIRTUALDRIVER_OT_target_add,
+    VIRTUALDRIVER_OT_target_remove,
     OBJECT_UL_VirtualDriver,
     OBJECT_PT_VirtualDriver
 )
@@ -462,6 +1310,14 @@ def register():
     if not virtual_driver_depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.append(virtual_driver_depsgraph_update_post)
 
+    if not virtual_driver_frame_change_post in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.append(virtual_driver_frame_change_post)
+
+    for handler in _VIRTUALDRIVER_CACHE_CLEAR_HANDLERS:
+        handlers: list = getattr(bpy.app.handlers, handler)
+        if not virtual_driver_cache_clear_post in handlers:
+            handlers.append(virtual_driver_cache_clear_post)
+
 def unregister():
     for cls in classes:
         bpy.utils.unregister_class(cls)
@@ -471,4 +1327,14 @@ def unregister():
 
     if virtual_driver_depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.remove(virtual_driver_depsgraph_update_post)
+
+    if virtual_driver_frame_change_post in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(virtual_driver_frame_change_post)
+
+    for handler in _VIRTUALDRIVER_CACHE_CLEAR_HANDLERS:
+        handlers: list = getattr(bpy.app.handlers, handler)
+        if virtual_driver_cache_clear_post in handlers:
+            handlers.remove(virtual_driver_cache_clear_post)
+
+    cache_clear()
 # endregion